@@ -184,6 +184,7 @@ def register_pairwise(
             optimizer=optimizer,
             max_steps=optim_loop.get("max_steps", 250),
             min_delta=float(optim_loop.get("min_delta", "nan")),
+            use_cuda_graph=bool(optim_loop.get("cuda_graph", False)),
         )
         grad_sigma = float(optim_loop.get("smooth_grad", 0))
         if isinstance(transform, NonRigidTransform) and grad_sigma > 0:
@@ -754,7 +755,7 @@ def get_optim_config(config: Dict[str, Any]) -> Tuple[str, Dict[str, Any], Dict[
     optim_name = str(cfg.pop("name", "LBFGS"))
     # Optimization loop parameters
     optim_loop = {}
-    for key in ("max_steps", "min_delta", "smooth_grad"):
+    for key in ("max_steps", "min_delta", "smooth_grad", "cuda_graph"):
         if key in cfg:
             optim_loop[key] = cfg.pop(key)
     # Optimizer keyword arguments (excl. optimizer class name keys starting with uppercase letter)
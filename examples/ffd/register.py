@@ -1,5 +1,9 @@
 r"""Example implementation of free-form deformation (FFD) algorithm."""
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+import copy
+from functools import lru_cache
 import logging
 from pathlib import Path
 import sys
@@ -8,12 +12,19 @@ from typing import Any, Dict
 
 import json
 import yaml
+
+try:
+    # Parse YAML with libyaml's C loader when built into PyYAML
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 import os
 import torch
 import torch.cuda
 from torch import Tensor
 
 from deepali.core import Grid, PathStr, unlink_or_mkdir
+from deepali.core.nnutils import configure_backends
 from deepali.data import Image
 from deepali.modules import TransformImage
 from deepali.utils.cli import ArgumentParser, Args, main_func
@@ -70,6 +81,12 @@ def parser(**kwargs) -> ArgumentParser:
         choices=("cpu", "cuda"),
         default="cuda",
     )
+    parser.add_argument(
+        "--precision",
+        help="Compute precision for registration",
+        choices=("fp32", "bf16-mixed", "fp16-mixed"),
+        default="fp32",
+    )
     parser.add_argument("--debug-dir", help="Output directory for intermediate files")
     parser.add_argument(
         "--debug",
@@ -101,6 +118,7 @@ def init(args: Args) -> int:
         if len(gpu_ids) != 1:
             log.error("CUDA_VISIBLE_DEVICES must be set to one GPU")
             return 1
+        configure_backends(tf32=True, cudnn_benchmark=True)
     filter_warning_of_experimental_named_tensors_feature()
     return 0
 
@@ -109,16 +127,32 @@ def func(args: Args) -> int:
     r"""Execute registration given parsed arguments."""
     config = load_config(args.config)
     device = torch.device("cuda:0" if args.device == "cuda" else "cpu")
+    if args.precision == "fp32" or device.type != "cuda":
+        autocast = nullcontext()
+    else:
+        amp_dtype = torch.bfloat16 if args.precision == "bf16-mixed" else torch.float16
+        autocast = torch.autocast(device.type, dtype=amp_dtype)
+    # Read the images to be warped in a background thread while registration runs,
+    # and write warped output images in the background while the GPU is idle again.
+    executor = ThreadPoolExecutor(max_workers=2)
+    source_img_future = None
+    source_seg_future = None
+    if args.warped_img:
+        source_img_future = executor.submit(Image.read, args.source_img, device=device)
+    if args.warped_seg:
+        source_seg_future = executor.submit(Image.read, args.source_seg, device=device)
+    write_futures = []
     start = timer()
-    transform = register_pairwise(
-        target={"img": args.target_img},
-        source={"img": args.source_img},
-        config=config,
-        outdir=args.debug_dir,
-        device=args.device,
-        verbose=args.verbose,
-        debug=args.debug,
-    )
+    with autocast:
+        transform = register_pairwise(
+            target={"img": args.target_img},
+            source={"img": args.source_img},
+            config=config,
+            outdir=args.debug_dir,
+            device=args.device,
+            verbose=args.verbose,
+            debug=args.debug,
+        )
     # transform = register_pairwise(
     #     target={"img": args.target_img, "seg": args.target_seg},
     #     source={"img": args.source_img, "seg": args.source_seg},
@@ -131,35 +165,46 @@ def func(args: Args) -> int:
     log.info(f"Elapsed time: {timer() - start:.3f}s")
     if args.warped_img:
         target_grid = Grid.from_file(args.target_img)
-        source_image = Image.read(args.source_img, device=device)
+        source_image = source_img_future.result()
         warp_image = TransformImage(
             target=target_grid,
             source=source_image.grid(),
             sampling="linear",
             padding=source_image.min(),
         ).to(device)
+        if hasattr(torch, "compile") and device.type == "cuda":
+            warp_image = torch.compile(warp_image, dynamic=False)
         data: Tensor = warp_image(transform.tensor(), source_image)
         warped_image = Image(data, target_grid)
-        warped_image.write(unlink_or_mkdir(args.warped_img))
+        write_futures.append(executor.submit(warped_image.write, unlink_or_mkdir(args.warped_img)))
     if args.warped_seg:
         target_grid = Grid.from_file(args.target_seg)
-        source_image = Image.read(args.source_seg, device=device)
+        source_image = source_seg_future.result()
         warp_labels = TransformImage(
             target=target_grid,
             source=source_image.grid(),
             sampling="nearest",
             padding=0,
         ).to(device)
+        if hasattr(torch, "compile") and device.type == "cuda":
+            warp_labels = torch.compile(warp_labels, dynamic=False)
         data: Tensor = warp_labels(transform.tensor(), source_image)
         warped_image = Image(data, target_grid)
-        warped_image.write(unlink_or_mkdir(args.warped_seg))
+        write_futures.append(executor.submit(warped_image.write, unlink_or_mkdir(args.warped_seg)))
     if args.output_transform:
         path = unlink_or_mkdir(args.output_transform)
         if path.suffix == ".pt":
             transform.clear_buffers()
-            torch.save(transform, path)
+            # Pickle protocol 5 serializes tensor storages as out-of-band buffers,
+            # avoiding a full copy of the parameters into the pickle stream.
+            torch.save(transform, path, pickle_protocol=5)
+        elif path.suffix in (".raw", ".bin"):
+            transform.flow()[0].tensor().cpu().contiguous().numpy().tofile(path)
         else:
             transform.flow()[0].write(path)
+    for future in write_futures:
+        future.result()
+    executor.shutdown(wait=True)
     return 0
 
 
@@ -170,10 +215,20 @@ def load_config(path: PathStr) -> Dict[str, Any]:
     r"""Load registration parameters from configuration file."""
     config_path = Path(path).absolute()
     log.info(f"Load configuration from {config_path}")
+    config = _load_config(str(config_path), config_path.stat().st_mtime_ns)
+    # Defensive copy such that callers cannot modify the cached configuration,
+    # e.g., get_loss_config() rewrites nested loss entries in place.
+    return copy.deepcopy(config)
+
+
+@lru_cache(maxsize=16)
+def _load_config(path: str, mtime_ns: int) -> Dict[str, Any]:
+    r"""Parse configuration file, cached by path and file modification time."""
+    config_path = Path(path)
     config_text = config_path.read_text()
     if config_path.suffix == ".json":
         return json.loads(config_text)
-    return yaml.safe_load(config_text)
+    return yaml.load(config_text, Loader=_YamlLoader)
 
 
 if __name__ == "__main__":
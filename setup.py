@@ -50,6 +50,7 @@ extras_require = {
     "utils": [
         "boto3",
         "pytorch-ignite>=0.4",
+        "numba",
         "numpy",
         "scipy",
         "SimpleITK~=2.0",
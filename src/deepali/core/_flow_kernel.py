@@ -0,0 +1,59 @@
+r"""Optional Numba-accelerated kernels for small-dimensional flow vector transforms."""
+
+from typing import Optional
+
+import torch
+from torch import Tensor
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _apply_vector_transform(flow, matrix, out):  # pragma: no cover
+        shared = matrix.shape[0] == 1
+        n_fields, n_dims, n_points = flow.shape
+        for n in prange(n_fields):
+            m = matrix[0] if shared else matrix[n]
+            for k in range(n_points):
+                for c in range(n_dims):
+                    value = 0.0
+                    for d in range(n_dims):
+                        value += m[c, d] * flow[n, d, k]
+                    out[n, c, k] = value
+
+
+def apply_vector_transform(flow: Tensor, matrix: Tensor) -> Optional[Tensor]:
+    r"""Apply batched square vector transformations using a Numba kernel when applicable.
+
+    For 2- or 3-dimensional flow fields on the CPU, the per-point matrix-vector products are
+    dominated by PyTorch dispatch and threading overhead rather than arithmetic. This kernel
+    performs the transformation in a single parallel loop over the batch without that overhead.
+
+    Args:
+        flow: Flow field batch tensor of shape ``(N, D, K)``, where ``K`` is the number
+            of flattened spatial points.
+        matrix: Vector transformation matrices of shape ``(1, D, D)`` or ``(N, D, D)``.
+
+    Returns:
+        Transformed flow tensor of shape ``(N, D, K)``, or ``None`` when Numba is unavailable
+        or the kernel is not applicable, in which case the caller must fall back to the
+        batched ``torch.matmul`` / ``torch.bmm`` implementation.
+
+    """
+    if njit is None:
+        return None
+    if flow.device.type != "cpu" or flow.requires_grad or matrix.requires_grad:
+        return None
+    if flow.shape[1] not in (2, 3) or flow.dtype not in (torch.float32, torch.float64):
+        return None
+    if matrix.dtype != flow.dtype:
+        matrix = matrix.type(flow.dtype)
+    flow = flow.contiguous()
+    out = torch.empty_like(flow)
+    _apply_vector_transform(flow.numpy(), matrix.contiguous().numpy(), out.numpy())
+    return out
@@ -20,6 +20,8 @@ class Sampling(Enum):
     @classmethod
     def from_arg(cls, arg: Union[Sampling, str, None]) -> Sampling:
         r"""Create enumeration value from function argument."""
+        if type(arg) is cls:
+            return arg
         if isinstance(arg, str):
             arg = arg.lower()
         if arg is None or arg in ("default", "bilinear", "trilinear"):
@@ -71,6 +73,8 @@ class PaddingMode(Enum):
     @classmethod
     def from_arg(cls, arg: Union[PaddingMode, str, None]) -> PaddingMode:
         r"""Create enumeration value from function argument."""
+        if type(arg) is cls:
+            return arg
         if isinstance(arg, str):
             arg = arg.lower()
         if arg is None or arg == "default":
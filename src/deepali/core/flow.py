@@ -133,22 +133,26 @@ def expv(
         raise ValueError("expv() 'steps' must be positive value")
     if steps == 0:
         return flow
-    device = flow.device
     grid = Grid(shape=flow.shape[2:], align_corners=align_corners)
-    grid = grid.coords(dtype=flow.dtype, device=device)
-    assert grid.device == device
+    coords = grid.coords(dtype=flow.dtype, device=flow.device)
+    num_spatial_dim = coords.shape[-1]
+    mode = Sampling.from_arg(sampling).grid_sample_mode(num_spatial_dim)
+    padding_mode = PaddingMode.from_arg(padding).grid_sample_mode(num_spatial_dim)
     disp = flow * (scale / 2**steps)
-    assert disp.device == device
+    return _expv_squaring(disp, coords, steps, mode, padding_mode, align_corners)
+
+
+@torch.jit.script
+def _expv_squaring(
+    disp: Tensor, grid: Tensor, steps: int, mode: str, padding_mode: str, align_corners: bool
+) -> Tensor:
+    r"""Scaling and squaring loop of ``expv()`` compiled as TorchScript function."""
+    dims = [0] + list(range(2, disp.dim())) + [1]  # channels last
     for _ in range(steps):
-        disp = disp + warp_image(
-            disp,
-            grid,
-            flow=move_dim(disp, 1, -1),  # channels last
-            mode=sampling,
-            padding=padding,
-            align_corners=align_corners,
+        coords = grid + disp.permute(dims)
+        disp = disp + F.grid_sample(
+            disp, coords, mode=mode, padding_mode=padding_mode, align_corners=align_corners
         )
-        assert disp.device == device
     return disp
 
 
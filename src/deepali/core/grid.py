@@ -61,6 +61,8 @@ class Axes(Enum):
     @classmethod
     def from_arg(cls, arg: Union[Axes, str, None]) -> Axes:
         r"""Create enumeration value from function argument."""
+        if type(arg) is cls:
+            return arg
         if arg is None or arg == "default":
             return cls.CUBE
         return cls(arg)
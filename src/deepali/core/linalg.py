@@ -112,7 +112,9 @@ def as_homogeneous_matrix(
     return tensor_
 
 
-def homogeneous_transform(transform: Tensor, points: Tensor, vectors: bool = False) -> Tensor:
+def homogeneous_transform(
+    transform: Tensor, points: Tensor, vectors: bool = False, out: Optional[Tensor] = None
+) -> Tensor:
     r"""Transform points or vectors by given homogeneous transformations.
 
     The data type used for matrix-vector products, as well as the data type of
@@ -136,6 +138,9 @@ def homogeneous_transform(transform: Tensor, points: Tensor, vectors: bool = Fal
             component of the given ``transforms`` is applied without any translation offset.
             If ``transforms`` is a 2-dimensional tensor of translation offsets, a tensor sharing
             the data memory of the input ``points`` is returned.
+        out: Preallocated output tensor with same dtype, device, and number of elements as the
+            result. When given, the transformed points are written into this tensor instead of
+            a newly allocated one. Must not be used when gradients are required.
 
     Returns:
         Tensor of transformed points/vectors with the same shape as the input ``points``, except
@@ -186,13 +191,20 @@ def homogeneous_transform(transform: Tensor, points: Tensor, vectors: bool = Fal
         transform = transform.type(points.dtype)
     else:
         points = points.type(transform.dtype)
+    if out is not None:
+        out = out.reshape(N, -1, D)
     if transform.shape[2] == 1:
         if not vectors:
-            points = points + transform[..., 0].unsqueeze(1)
+            points = torch.add(points, transform[..., 0].unsqueeze(1), out=out)
+        elif out is not None:
+            points = out.copy_(points)
     else:
-        points = torch.bmm(points, transform[:, :D, :D].transpose(1, 2))
+        matrix = transform[:, :D, :D].transpose(1, 2)
         if not vectors and transform.shape[2] == D + 1:
-            points += transform[..., D].unsqueeze(1)
+            # Fused matrix product and translation in a single GEMM kernel
+            points = torch.baddbmm(transform[..., D].unsqueeze(1), points, matrix, out=out)
+        else:
+            points = torch.bmm(points, matrix, out=out)
     return points.reshape(output_shape)
 
 
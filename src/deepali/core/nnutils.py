@@ -1,4 +1,5 @@
 from collections import namedtuple
+from functools import lru_cache
 from typing import Any, Iterable, Mapping, NamedTuple, Optional, Sequence, Tuple, Union, overload
 
 import torch
@@ -7,6 +8,23 @@ from torch import Size, Tensor
 from .types import ScalarOrTuple
 
 
+def configure_backends(tf32: bool = True, cudnn_benchmark: bool = True) -> None:
+    r"""Configure PyTorch backend flags for faster CUDA execution.
+
+    Args:
+        tf32: Allow use of TensorFloat-32 tensor cores for matrix multiplications
+            and cuDNN convolutions on Ampere or newer GPUs. This trades a small
+            amount of precision for a considerable speed up of float32 operations.
+        cudnn_benchmark: Enable the cuDNN auto-tuner to select the fastest convolution
+            algorithms for the encountered input shapes. Only beneficial when input
+            shapes do not vary between iterations.
+
+    """
+    torch.backends.cuda.matmul.allow_tf32 = bool(tf32)
+    torch.backends.cudnn.allow_tf32 = bool(tf32)
+    torch.backends.cudnn.benchmark = bool(cudnn_benchmark)
+
+
 def get_namedtuple_item(self: NamedTuple, arg: Union[int, str]) -> Any:
     if isinstance(arg, str):
         return getattr(self, arg)
@@ -259,6 +277,19 @@ def same_padding(
         NotImplementedError: When ``(kernel_size - 1) * dilation`` is an odd number.
 
     """
+    # Memoize result as this function is a pure function of small integer arguments which
+    # is called on the construction path of every convolutional layer of a network.
+    if not isinstance(kernel_size, (int, tuple)):
+        kernel_size = tuple(kernel_size)
+    if not isinstance(dilation, (int, tuple)):
+        dilation = tuple(dilation)
+    return _same_padding(kernel_size, dilation)
+
+
+@lru_cache(maxsize=256)
+def _same_padding(
+    kernel_size: ScalarOrTuple[int], dilation: ScalarOrTuple[int]
+) -> ScalarOrTuple[int]:
     # Adapted from Project MONAI
     # https://github.com/Project-MONAI/MONAI/blob/db8f7877da06a9b3710071c626c0488676716be1/monai/networks/layers/convutils.py
     device = torch.device("cpu")
@@ -299,6 +330,19 @@ def stride_minus_kernel_padding(kernel_size: int, stride: Sequence[int]) -> Tupl
 
 def stride_minus_kernel_padding(
     kernel_size: ScalarOrTuple[int], stride: ScalarOrTuple[int]
+) -> ScalarOrTuple[int]:
+    # Memoize result as this function is a pure function of small integer arguments which
+    # is called on the construction path of every convolutional layer of a network.
+    if not isinstance(kernel_size, (int, tuple)):
+        kernel_size = tuple(kernel_size)
+    if not isinstance(stride, (int, tuple)):
+        stride = tuple(stride)
+    return _stride_minus_kernel_padding(kernel_size, stride)
+
+
+@lru_cache(maxsize=256)
+def _stride_minus_kernel_padding(
+    kernel_size: ScalarOrTuple[int], stride: ScalarOrTuple[int]
 ) -> ScalarOrTuple[int]:
     # Adapted from Project MONAI
     # https://github.com/Project-MONAI/MONAI/blob/db8f7877da06a9b3710071c626c0488676716be1/monai/networks/layers/convutils.py
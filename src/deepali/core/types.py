@@ -1,11 +1,12 @@
 r"""Type annotations for torch functions."""
 
 from dataclasses import Field
+from functools import lru_cache
 from pathlib import Path
 import re
 from typing import Any, Dict, List, Mapping, NamedTuple
 from typing import Optional, Sequence, Tuple, TypeVar, Union
-from typing_extensions import Protocol
+from typing_extensions import Protocol, get_args, get_origin
 
 import torch
 
@@ -59,18 +60,37 @@ TensorCollection = Union[
 ]
 
 
+@lru_cache(maxsize=256)
+def _tensor_collection_key_tokens(key: str) -> Tuple[Tuple[str, Optional[int]], ...]:
+    r"""Parse hierarchical output entry key into tokens, with memoized result.
+
+    Each token is a tuple of the name string and its integer value when the token
+    is a valid sequence index, such that repeated lookups of the same key skip the
+    regular expression substitution, split, and integer conversions.
+
+    """
+    key = RE_OUTPUT_KEY_INDEX.sub(r".\1", key)
+    tokens = []
+    for name in key.split("."):
+        try:
+            index = int(name)
+        except ValueError:
+            index = None
+        tokens.append((name, index))
+    return tuple(tokens)
+
+
 def tensor_collection_entry(output: TensorCollection, key: str) -> Union[TensorCollection, Tensor]:
     r"""Get specified output entry."""
-    key = RE_OUTPUT_KEY_INDEX.sub(r".\1", key)
-    for index in key.split("."):
+    for name, index in _tensor_collection_key_tokens(key):
         if isinstance(output, (list, tuple)):
-            try:
-                index = int(index)
-            except TypeError:
+            if index is None:
                 raise KeyError(f"invalid output key {key}")
-        elif not index or not isinstance(output, dict):
-            raise KeyError(f"invalid output key {key}")
-        output = output[index]
+            output = output[index]
+        else:
+            if not name or not isinstance(output, dict):
+                raise KeyError(f"invalid output key {key}")
+            output = output[name]
     return output
 
 
@@ -82,29 +102,51 @@ def get_tensor(output: TensorCollection, key: str) -> Tensor:
     return item
 
 
+# Kind codes such that a dtype is classified with a single dict probe
+_KIND_BOOL, _KIND_FLOAT, _KIND_INT, _KIND_UINT = range(4)
+
+_DTYPE_KIND = {
+    torch.bool: _KIND_BOOL,
+    torch.float16: _KIND_FLOAT,
+    torch.float32: _KIND_FLOAT,
+    torch.float64: _KIND_FLOAT,
+    torch.int8: _KIND_INT,
+    torch.int16: _KIND_INT,
+    torch.int32: _KIND_INT,
+    torch.int64: _KIND_INT,
+    torch.uint8: _KIND_UINT,
+}
+
+
 def is_bool_dtype(dtype: DType) -> bool:
     r"""Checks if ``dtype`` of given NumPy array or PyTorch tensor is boolean type."""
-    return dtype in (torch.bool,)
+    return _DTYPE_KIND.get(dtype) == _KIND_BOOL
 
 
 def is_float_dtype(dtype: DType) -> bool:
     r"""Checks if ``dtype`` of given tensor is a floating point type."""
-    return dtype in (torch.float16, torch.float32, torch.float64)
+    return _DTYPE_KIND.get(dtype) == _KIND_FLOAT
 
 
 def is_int_dtype(dtype: DType) -> bool:
     r"""Checks if ``dtype`` of given tensor is a signed integer type."""
-    return dtype in (torch.int8, torch.int16, torch.int32, torch.int64)
+    return _DTYPE_KIND.get(dtype) == _KIND_INT
 
 
 def is_uint_dtype(dtype: DType) -> bool:
     r"""Checks if ``dtype`` of given tensor is an unsigned integer type."""
-    return dtype in (torch.uint8,)
+    return _DTYPE_KIND.get(dtype) == _KIND_UINT
+
+
+@lru_cache(maxsize=None)
+def _is_namedtuple_type(cls: type) -> bool:
+    r"""Check if given type is a named tuple type, with memoized result."""
+    return issubclass(cls, tuple) and hasattr(cls, "_fields")
 
 
 def is_namedtuple(arg: Any) -> bool:
     r"""Check if given object is a named tuple."""
-    return isinstance(arg, tuple) and hasattr(arg, "_fields")
+    return _is_namedtuple_type(type(arg))
 
 
 def is_optional_field(field: Field) -> bool:
@@ -124,6 +166,9 @@ def is_path_str(arg: Any) -> bool:
     return isinstance(arg, (Path, str))
 
 
+_PATH_STR_TYPE_HINTS = frozenset({"Path", "Optional[Path]", "PathStr", "Optional[PathStr]"})
+
+
 def is_path_str_type_hint(type_hint: Any, required: bool = False) -> bool:
     r"""Check if given type annotation is ``pathlib.Path``, ``PathStr = Union[pathlib.Path, str]``.
 
@@ -139,22 +184,24 @@ def is_path_str_type_hint(type_hint: Any, required: bool = False) -> bool:
         path string types also results in a return value of ``True``.
 
     """
-    if type_hint in (Path, "Path", "Optional[Path]", "PathStr", "Optional[PathStr]"):
+    if type_hint is Path:
         return True
-    type_origin = getattr(type_hint, "__origin__", None)
-    if type_origin is Union:
-        type_args = set(type_hint.__args__)
-        if not required:
-            type_args.discard(type(None))
-            type_args.discard("None")
-        type_args.discard(str)
-        type_args.discard("str")
-        if not type_args:
+    if isinstance(type_hint, str):
+        return type_hint in _PATH_STR_TYPE_HINTS
+    if get_origin(type_hint) is Union:
+        found = False
+        for type_arg in get_args(type_hint):
+            if type_arg is type(None) or type_arg == "None":
+                if required:
+                    return False
+                continue
+            if type_arg is str or type_arg == "str":
+                continue
+            if type_arg in (Path, "Path", "PathStr"):
+                found = True
+                continue
             return False
-        for type_arg in type_args:
-            if type_arg not in (Path, "Path", "PathStr"):
-                return False
-        return True
+        return found
     return False
 
 
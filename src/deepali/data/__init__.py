@@ -6,6 +6,7 @@ from .prepare import prepare_batch
 from .dataset import Dataset
 from .dataset import ImageDataset
 from .dataset import ImageDatasetConfig
+from .dataset import MemmapImageDataset
 from .dataset import MetaDataset
 from .dataset import GroupDataset
 from .dataset import JoinDataset
@@ -32,6 +33,7 @@ __all__ = (
     "ImageDataset",
     "ImageDatasetConfig",
     "JoinDataset",
+    "MemmapImageDataset",
     "MetaDataset",
     # Data partitioning
     "dataset_split_lengths",
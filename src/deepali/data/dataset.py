@@ -6,17 +6,23 @@ from abc import ABCMeta, abstractmethod
 from copy import copy as shallowcopy
 from dataclasses import dataclass, field
 from pathlib import Path
+import pickle
 from typing import Any, Callable, Dict, List, Iterable, Iterator
 from typing import Mapping, Optional, Union, Sequence, TypeVar, overload
+import warnings
 
+import numpy as np
 import pandas as pd
 
+import torch
 from torch.nn import Sequential
 from torch.utils.data import Dataset as TorchDataset, Subset
 
 from ..core.config import DataclassConfig
+from ..core.grid import Grid
 from ..core.types import PathStr, Sample, is_namedtuple, is_path_str
 
+from .image import Image
 from .transforms import Transform
 from .transforms.image import ImageTransformConfig
 from .transforms.image import image_transforms, prepend_read_image_transform
@@ -27,6 +33,7 @@ __all__ = (
     "MetaDataset",
     "ImageDataset",
     "ImageDatasetConfig",
+    "MemmapImageDataset",
     "GroupDataset",
     "JoinDataset",
     "read_table",
@@ -414,6 +421,133 @@ class ImageDataset(MetaDataset):
         )
 
 
+class MemmapImageDataset(Dataset):
+    r"""Image dataset backed by memory-mapped arrays.
+
+    The image data of another dataset, e.g., an ``ImageDataset`` which reads individual
+    image files, is packed once into one ``.npy`` file per image key, with an index file
+    storing the sampling grids and sample meta-data. Samples are subsequently served from
+    memory-mapped arrays, such that data loader workers share the operating system page
+    cache and no per-sample image file decoding is required. All images of a given key
+    must have the same shape and data type, e.g., after a resampling transform.
+
+    """
+
+    INDEX_FILE = "index.pt"
+
+    def __init__(
+        self,
+        path: PathStr,
+        transforms: Optional[Union[Transform, Sequence[Transform]]] = None,
+    ):
+        r"""Initialize dataset from packed image files.
+
+        Args:
+            path: Directory containing the packed image data (cf. ``pack()``).
+            transforms: Data preprocessing and augmentation transforms.
+
+        """
+        path = Path(path).absolute()
+        # Index file contains Grid objects and thus requires unrestricted unpickling
+        index = torch.load(path / self.INDEX_FILE, pickle_module=pickle)
+        self.path = path
+        self.grids: Dict[str, List[Grid]] = index["grids"]
+        self.meta: List[Dict[str, Any]] = index["meta"]
+        self.arrays = {
+            name: np.load(path / f"{name}.npy", mmap_mode="r") for name in index["keys"]
+        }
+        super().__init__(transforms=transforms)
+
+    @classmethod
+    def pack(
+        cls,
+        dataset: Dataset,
+        path: PathStr,
+        keys: Optional[Sequence[str]] = None,
+        overwrite: bool = False,
+    ) -> MemmapImageDataset:
+        r"""Pack image data of given dataset into memory-mapped arrays.
+
+        Args:
+            dataset: Dataset whose processed samples are dictionaries with ``Image`` values.
+            path: Directory in which to write the packed image data files.
+            keys: Keys of sample images to pack. If ``None``, pack all image entries.
+            overwrite: Whether to re-pack the dataset when ``path`` already exists.
+
+        Returns:
+            Dataset of packed memory-mapped image data.
+
+        """
+        path = Path(path).absolute()
+        if (path / cls.INDEX_FILE).is_file() and not overwrite:
+            return cls(path)
+        path.mkdir(parents=True, exist_ok=True)
+        arrays = {}
+        grids: Dict[str, List[Grid]] = {}
+        meta: List[Dict[str, Any]] = []
+        for index in range(len(dataset)):
+            sample = dataset[index]
+            if not isinstance(sample, Mapping):
+                raise TypeError(
+                    f"{cls.__name__}.pack() 'dataset' samples must be dictionaries"
+                )
+            meta.append(dict(sample.get("meta", {})))
+            for name, value in sample.items():
+                if name == "meta" or not isinstance(value, Image):
+                    continue
+                if keys is not None and name not in keys:
+                    continue
+                data = value.tensor().cpu().numpy()
+                array = arrays.get(name)
+                if array is None:
+                    if index > 0:
+                        raise ValueError(
+                            f"{cls.__name__}.pack() image '{name}' first occurs in sample"
+                            f" {index}, but is missing from previous samples"
+                        )
+                    array = np.lib.format.open_memmap(
+                        path / f"{name}.npy",
+                        mode="w+",
+                        dtype=data.dtype,
+                        shape=(len(dataset),) + data.shape,
+                    )
+                    arrays[name] = array
+                    grids[name] = []
+                elif data.shape != array.shape[1:]:
+                    raise ValueError(
+                        f"{cls.__name__}.pack() image '{name}' of sample {index} has shape"
+                        f" {data.shape}, but previous samples have shape {array.shape[1:]}"
+                    )
+                array[index] = data
+                grids[name].append(value.grid())
+            for name in arrays:
+                if len(grids[name]) != index + 1:
+                    raise ValueError(
+                        f"{cls.__name__}.pack() sample {index} is missing image '{name}'"
+                    )
+        for array in arrays.values():
+            array.flush()
+        torch.save({"keys": tuple(arrays), "grids": grids, "meta": meta}, path / cls.INDEX_FILE)
+        return cls(path)
+
+    def __len__(self) -> int:
+        r"""Number of samples in dataset."""
+        return len(self.meta)
+
+    def sample(self, index: int) -> Dict[str, Any]:
+        r"""Memory-mapped image data and meta-data of i-th sample in dataset."""
+        data: Dict[str, Any] = {}
+        with warnings.catch_warnings():
+            # Suppress warning that the tensor wrapping the read-only memory-mapped
+            # array is not writable; the image data is only read from.
+            warnings.simplefilter("ignore", UserWarning)
+            for name, array in self.arrays.items():
+                tensor = torch.from_numpy(array[index])
+                data[name] = Image(tensor, self.grids[name][index])
+        data["meta"] = self.meta[index]
+        return data
+
+
 class GroupDataset(TorchDataset):
     r"""Group samples in dataset."""
 
@@ -10,7 +10,8 @@ from torch.nn import functional as F
 
 from ..core.enum import PaddingMode, Sampling
 from ..core import flow as U
-from ..core.grid import Axes, Grid, grid_transform_vectors
+from ..core._flow_kernel import apply_vector_transform
+from ..core.grid import Axes, Grid
 from ..core.tensor import move_dim
 from ..core.types import Array, Device, DType, PathStr, Scalar
 
@@ -166,18 +167,45 @@ class FlowFields(ImageBatch):
         r"""Get new batch of flow fields with flow vectors defined with respect to specified axes."""
         ...
 
+    def _vector_transform(self: TFlowFields, axes: Axes) -> Tensor:
+        r"""Vector transformation matrices from current to specified axes.
+
+        The per-grid square matrices are packed into a single batched tensor such that callers
+        can apply all transformations with one batched matrix product instead of iterating the
+        grid list in Python. When all grids share the same transformation, the returned tensor
+        has shape ``(1, D, D)`` and can be broadcast across the batch; otherwise its shape is
+        ``(N, D, D)``. The result is cached per grid set and axes pair.
+
+        """
+        key = (tuple(id(g) for g in self._grid), self._axes, axes)
+        cache = getattr(self, "_matrix_cache", None)
+        if cache is not None and cache[0] == key:
+            return cache[2]
+        matrices = torch.stack([g.transform(self._axes, axes, vectors=True) for g in self._grid])
+        if len(matrices) > 1 and matrices.eq(matrices[0]).all():
+            matrices = matrices[:1]
+        # Keep a reference to the grids such that cached object ids remain valid.
+        self._matrix_cache = (key, self._grid, matrices)
+        return matrices
+
     def axes(self: TFlowFields, axes: Optional[Axes] = None) -> Union[Axes, TFlowFields]:
         r"""Rescale and reorient vectors."""
         if axes is None:
             return self._axes
+        axes = Axes.from_arg(axes)
+        if axes is self._axes:
+            return self
         data = self.tensor()
-        data = move_dim(data, 1, -1)
-        data = tuple(
-            grid.transform_vectors(data[i : i + 1], axes=self._axes, to_axes=axes)
-            for i, grid in enumerate(self._grid)
-        )
-        data = torch.cat(data, dim=0)
-        data = move_dim(data, -1, 1)
+        if self._grid:
+            matrix = self._vector_transform(axes).to(data)
+            flat = data.reshape(data.shape[0], data.shape[1], -1)
+            result = apply_vector_transform(flat, matrix)
+            if result is None:
+                if matrix.shape[0] == 1:
+                    result = torch.matmul(matrix[0], flat)
+                else:
+                    result = torch.bmm(matrix, flat)
+            data = result.reshape(data.shape)
         return self._make_instance(data, self._grid, axes)
 
     def curl(self: TFlowFields, mode: str = "central") -> ImageBatch:
@@ -194,12 +222,31 @@ class FlowFields(ImageBatch):
         steps: Optional[int] = None,
         sampling: Union[Sampling, str] = Sampling.LINEAR,
         padding: Union[PaddingMode, str] = PaddingMode.BORDER,
+        compute_dtype: Optional[DType] = None,
     ) -> TFlowFields:
-        r"""Group exponential maps of flow fields computed using scaling and squaring."""
+        r"""Group exponential maps of flow fields computed using scaling and squaring.
+
+        Args:
+            scale: Constant scaling factor of input velocities.
+            steps: Number of scaling and squaring steps.
+            sampling: Flow field interpolation mode used when composing flow fields.
+            padding: Flow field extrapolation mode used when composing flow fields.
+            compute_dtype: Data type used for the scaling and squaring iterations, e.g.,
+                ``torch.bfloat16`` to halve the memory traffic of the repeated flow field
+                compositions. The result is cast back to the data type of this flow field.
+                If ``None``, compute in the current data type.
+
+        """
         axes = self._axes
         align_corners = axes is Axes.CUBE_CORNERS
-        flow = self.axes(Axes.CUBE_CORNERS if align_corners else Axes.CUBE)
-        data = self.tensor()
+        target = Axes.CUBE_CORNERS if align_corners else Axes.CUBE
+        # Skip the axes round-trip when vectors are already with respect to the unit cube,
+        # which avoids two full-size batched affine transformations of the vector field.
+        flow = self if axes is target else self.axes(target)
+        data = flow.tensor()
+        dtype = data.dtype
+        if compute_dtype is not None and compute_dtype != dtype:
+            data = data.type(compute_dtype)
         data = U.expv(
             data,
             scale=scale,
@@ -208,8 +255,11 @@ class FlowFields(ImageBatch):
             padding=padding,
             align_corners=align_corners,
         )
-        flow = self._make_instance(data, flow._grid, flow._axes)
-        flow = flow.axes(axes)  # restore original axes
+        if data.dtype != dtype:
+            data = data.type(dtype)
+        flow = self._make_instance(data, self._grid, target)
+        if axes is not target:
+            flow = flow.axes(axes)  # restore original axes
         return flow
 
     def sample(
@@ -244,18 +294,39 @@ class FlowFields(ImageBatch):
             axes = flow.axes()
             if axes != Axes.WORLD:
                 data = flow.tensor()
-                data = U.move_dim(data, 1, -1)
-                data = torch.cat(
+                # Apply all vector transformations with one batched matrix product over the
+                # channel dimension instead of allocating a per-sample result and torch.cat.
+                matrix = torch.stack(
                     [
-                        grid_transform_vectors(v, grid, axes, to_grid, axes).unsqueeze_(0)
-                        for v, grid, to_grid in zip(data, self._grid, flow.grids())
-                    ],
-                    dim=0,
-                )
-                data = U.move_dim(data, -1, 1)
+                        grid.transform(axes, to_axes=axes, to_grid=to_grid, vectors=True)
+                        for grid, to_grid in zip(self._grid, flow.grids())
+                    ]
+                ).to(data)
+                flat = data.reshape(data.shape[0], data.shape[1], -1)
+                data = torch.bmm(matrix, flat).reshape(data.shape)
                 flow = self._make_instance(data, flow.grids())
         return flow
 
+    def _warp_coords(self: TFlowFields, align_corners: bool) -> Tensor:
+        r"""Batched tensor of normalized grid point coordinates used by ``warp_image()``.
+
+        The normalized coordinates depend only on the spatial shape shared by all sampling
+        grids of the batch, not on their world placement. The mesh is therefore generated
+        once directly on the target device, broadcast across the batch dimension as a
+        zero-copy view, and cached such that repeated warps (e.g., within a training loop)
+        do not regenerate identical mesh tensors on every call.
+
+        """
+        grid = self._grid[0]
+        key = (grid.shape, grid.dtype, len(self._grid), align_corners, self.device)
+        cache = getattr(self, "_coords_cache", None)
+        if cache is not None and cache[0] == key:
+            return cache[1]
+        coords = grid.coords(align_corners=align_corners, device=self.device)
+        coords = coords.unsqueeze(0).expand(len(self._grid), *coords.shape)
+        self._coords_cache = (key, coords)
+        return coords
+
     def warp_image(
         self: TFlowFields,
         image: Union[Image, ImageBatch],
@@ -278,8 +349,7 @@ class FlowFields(ImageBatch):
         if isinstance(image, Image):
             image = image.batch()
         align_corners = self._axes is Axes.CUBE_CORNERS
-        grid = (g.coords(align_corners=align_corners, device=self.device) for g in self._grid)
-        grid = torch.cat(tuple(g.unsqueeze(0) for g in grid), dim=0)
+        grid = self._warp_coords(align_corners)
         flow = self.axes(Axes.from_align_corners(align_corners))
         flow = flow.tensor()
         flow = move_dim(flow, 1, -1)
@@ -444,9 +514,22 @@ class FlowField(Image):
         return cls(image, image._grid, axes)
 
     def batch(self: TFlowField) -> FlowFields:
-        r"""Batch of flow fields containing only this flow field."""
-        data = self.unsqueeze(0)
-        return FlowFields(data, self._grid, self._axes)
+        r"""Batch of flow fields containing only this flow field.
+
+        The returned batch is a zero-copy view on the data tensor of this flow field.
+        It is cached on the instance such that repeated single-image operations which
+        funnel through ``batch()`` do not reconstruct the wrapper on every call. The
+        cache is bypassed when the sampling grid or axes have been replaced.
+
+        """
+        key = (id(self._grid), self._axes)
+        cache = getattr(self, "_batch_cache", None)
+        if cache is not None and cache[0] == key:
+            return cache[1]
+        data = self.tensor().unsqueeze(0)
+        batch = FlowFields(data, self._grid, self._axes)
+        self._batch_cache = (key, batch)
+        return batch
 
     @overload
     def axes(self: TFlowField) -> Axes:
@@ -462,9 +545,13 @@ class FlowField(Image):
         r"""Rescale and reorient vectors with respect to specified axes."""
         if axes is None:
             return self._axes
-        batch = self.batch()
-        batch = batch.axes(axes)
-        return batch[0]
+        axes = Axes.from_arg(axes)
+        if axes is self._axes:
+            return self
+        data = self.tensor()
+        matrix = self._grid.transform(self._axes, axes, vectors=True).to(data)
+        data = torch.matmul(matrix, data.reshape(data.shape[0], -1)).reshape(data.shape)
+        return self._make_instance(data, self._grid, axes)
 
     @classmethod
     def from_sitk(
@@ -488,9 +575,9 @@ class FlowField(Image):
 
     def curl(self: TFlowField, mode: str = "central") -> Image:
         r"""Compute curl of vector field."""
-        batch = self.batch()
-        rotvec = batch.curl(mode=mode)
-        return rotvec[0]
+        data = self.tensor().unsqueeze(0)
+        data = U.curl(data, spacing=self.spacing(), mode=mode)
+        return Image(data.squeeze(0), self._grid)
 
     def exp(
         self: TFlowField,
@@ -498,11 +585,31 @@ class FlowField(Image):
         steps: Optional[int] = None,
         sampling: Union[Sampling, str] = Sampling.LINEAR,
         padding: Union[PaddingMode, str] = PaddingMode.BORDER,
+        compute_dtype: Optional[DType] = None,
     ) -> TFlowField:
         r"""Group exponential map of vector field computed using scaling and squaring."""
-        batch = self.batch()
-        batch = batch.exp(scale=scale, steps=steps, sampling=sampling, padding=padding)
-        return batch[0]
+        axes = self._axes
+        align_corners = axes is Axes.CUBE_CORNERS
+        target = Axes.CUBE_CORNERS if align_corners else Axes.CUBE
+        flow = self if axes is target else self.axes(target)
+        data = flow.tensor().unsqueeze(0)
+        dtype = data.dtype
+        if compute_dtype is not None and compute_dtype != dtype:
+            data = data.type(compute_dtype)
+        data = U.expv(
+            data,
+            scale=scale,
+            steps=steps,
+            sampling=sampling,
+            padding=padding,
+            align_corners=align_corners,
+        )
+        if data.dtype != dtype:
+            data = data.type(dtype)
+        flow = self._make_instance(data.squeeze(0), self._grid, target)
+        if axes is not target:
+            flow = flow.axes(axes)
+        return flow
 
     @overload
     def warp_image(
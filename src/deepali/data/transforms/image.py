@@ -1,11 +1,12 @@
 r"""Image data transforms."""
 
+from functools import partial, wraps
 from pathlib import Path
-from typing import List, Mapping, Optional, Sequence, Union
+from typing import Callable, List, Mapping, Optional, Sequence, Union
 
 import torch
 from torch import Tensor
-from torch.nn import Module
+from torch.nn import Module, ModuleList
 
 from ...core.enum import PaddingMode, Sampling
 from ...core.types import PathStr, ScalarOrTuple
@@ -20,6 +21,7 @@ __all__ = (
     "CenterCropImage",
     "CenterPadImage",
     "ClampImage",
+    "FusedIntensityTransform",
     "ImageToTensor",
     "NarrowImage",
     "NormalizeImage",
@@ -28,6 +30,7 @@ __all__ = (
     "RescaleImage",
     "ResizeImage",
     "ImageTransformConfig",
+    "compile_image_transforms",
     "config_has_read_image_transform",
     "prepend_read_image_transform",
     "image_transform",
@@ -35,6 +38,39 @@ __all__ = (
 )
 
 
+def _require_image(forward: Callable) -> Callable:
+    r"""Decorator which checks that the transform input is an ``Image``.
+
+    Centralizes the per-call isinstance guard of the image transform ``forward`` methods.
+    When Python is run with ``-O``, the check is elided and the undecorated method is used.
+
+    """
+    if not __debug__:
+        return forward
+
+    @wraps(forward)
+    def wrapper(self, image: Image):
+        if not isinstance(image, Image):
+            raise TypeError(f"{type(self).__name__}.forward() argument must be Image")
+        return forward(self, image)
+
+    return wrapper
+
+
+class _FastItemwiseTransform:
+    r"""Mixin which bypasses the ``torch.nn.Module`` hook machinery on call.
+
+    Trivial stateless transforms are dominated by the ``Module.__call__`` dispatch overhead
+    rather than the actual work. Transforms using this mixin must not rely on forward hooks.
+
+    """
+
+    __slots__ = ()
+
+    def __call__(self, *args, **kwargs):
+        return self.forward(*args, **kwargs)
+
+
 class AvgPoolImage(ItemwiseTransform, Module):
     r"""Downsample image using average pooling."""
 
@@ -53,9 +89,8 @@ class AvgPoolImage(ItemwiseTransform, Module):
         self.ceil_mode = ceil_mode
         self.count_include_pad = count_include_pad
 
+    @_require_image
     def forward(self, image: Image) -> Image:
-        if not isinstance(image, Image):
-            raise TypeError(f"{type(self).__name__}.forward() argument must be Image")
         return image.avg_pool(
             self.kernel_size,
             stride=self.stride,
@@ -75,7 +110,7 @@ class AvgPoolImage(ItemwiseTransform, Module):
         )
 
 
-class CastImage(ItemwiseTransform, Module):
+class CastImage(_FastItemwiseTransform, ItemwiseTransform, Module):
     r"""Cast image data to specified type."""
 
     def __init__(self, dtype: Union[torch.dtype, str]) -> None:
@@ -93,25 +128,25 @@ class CastImage(ItemwiseTransform, Module):
             raise TypeError(f"{type(self).__name__}() 'dtype' must by dtype name or torch.dtype")
         self.dtype = dtype
 
+    @_require_image
     def forward(self, image: Image) -> Image:
-        if not isinstance(image, Image):
-            raise TypeError(f"{type(self).__name__}.forward() argument must be Image")
+        if image.dtype == self.dtype:
+            return image
         return image.type(self.dtype)
 
     def __repr__(self) -> str:
         return type(self).__name__ + f"(dtype={self.dtype!r})"
 
 
-class CenterCropImage(ItemwiseTransform, Module):
+class CenterCropImage(_FastItemwiseTransform, ItemwiseTransform, Module):
     r"""Crop image to specified maximum output size."""
 
     def __init__(self, size: Union[int, Sequence[int]]) -> None:
         super().__init__()
         self.size = size
 
+    @_require_image
     def forward(self, image: Image) -> Image:
-        if not isinstance(image, Image):
-            raise TypeError(f"{type(self).__name__}.forward() argument must be Image")
         return image.center_crop(self.size)
 
     def __repr__(self) -> str:
@@ -132,9 +167,8 @@ class CenterPadImage(ItemwiseTransform, Module):
         self.mode = PaddingMode(mode)
         self.value = float(value)
 
+    @_require_image
     def forward(self, image: Image) -> Image:
-        if not isinstance(image, Image):
-            raise TypeError(f"{type(self).__name__}.forward() argument must be Image")
         return image.center_pad(self.size, mode=self.mode, value=self.value)
 
     def __repr__(self) -> str:
@@ -158,9 +192,10 @@ class ClampImage(ItemwiseTransform, Module):
         self.max = max
         self.inplace = bool(inplace)
 
+    @_require_image
     def forward(self, image: Image) -> Image:
-        if not isinstance(image, Image):
-            raise TypeError(f"{type(self).__name__}.forward() argument must be Image")
+        if self.min is None and self.max is None:
+            return image
         clamp_fn = image.clamp_ if self.inplace else image.clamp
         image = clamp_fn(self.min, self.max)
         return image
@@ -171,19 +206,18 @@ class ClampImage(ItemwiseTransform, Module):
         )
 
 
-class ImageToTensor(ItemwiseTransform, Module):
+class ImageToTensor(_FastItemwiseTransform, ItemwiseTransform, Module):
     r"""Convert image to data tensor."""
 
+    @_require_image
     def forward(self, image: Image) -> Tensor:
-        if not isinstance(image, Image):
-            raise TypeError(f"{type(self).__name__}.forward() argument must be Image")
         return image.tensor()
 
     def __repr__(self) -> str:
         return type(self).__name__ + "()"
 
 
-class NarrowImage(ItemwiseTransform, Module):
+class NarrowImage(_FastItemwiseTransform, ItemwiseTransform, Module):
     r"""Return image with data tensor narrowed along specified dimension."""
 
     def __init__(self, dim: int, start: int, length: int = 1) -> None:
@@ -197,9 +231,8 @@ class NarrowImage(ItemwiseTransform, Module):
         self.start = start
         self.length = length
 
+    @_require_image
     def forward(self, image: Image) -> Tensor:
-        if not isinstance(image, Image):
-            raise TypeError(f"{type(self).__name__}.forward() argument must be Image")
         image = image.narrow(self.dim, self.start, self.length)
         return image
 
@@ -225,9 +258,8 @@ class NormalizeImage(ItemwiseTransform, Module):
         self.mode = mode
         self.inplace = inplace
 
+    @_require_image
     def forward(self, image: Image) -> Image:
-        if not isinstance(image, Image):
-            raise TypeError(f"{type(self).__name__}.forward() argument must be Image")
         normalize_fn = image.normalize_ if self.inplace else image.normalize
         return normalize_fn(mode=self.mode, min=self.min, max=self.max)
 
@@ -245,6 +277,7 @@ class ReadImage(ItemwiseTransform, Module):
         self,
         dtype: Optional[Union[torch.dtype, str]] = None,
         device: Optional[Union[str, torch.device]] = None,
+        pin_memory: bool = True,
     ) -> None:
         super().__init__()
         if isinstance(dtype, str):
@@ -256,15 +289,28 @@ class ReadImage(ItemwiseTransform, Module):
             raise TypeError("ReadImage() 'dtype' must by None or torch.dtype")
         self.dtype = dtype
         self.device = torch.device(device or "cpu")
+        self.pin_memory = bool(pin_memory)
 
     def forward(self, path: PathStr) -> Image:
         if not isinstance(path, (str, Path)):
             raise TypeError(f"{type(self).__name__}() 'path' must be Path or str")
+        if self.device.type == "cuda":
+            # Read into (pinned) host memory and issue an asynchronous host-to-device copy
+            # such that the transfer can overlap with reading the next sample from disk.
+            image = Image.read(path, dtype=self.dtype)
+            data = image.tensor()
+            if self.pin_memory and not data.is_pinned():
+                data = data.pin_memory()
+            data = data.to(self.device, non_blocking=True)
+            return Image(data, image.grid())
         image = Image.read(path, dtype=self.dtype, device=self.device)
         return image
 
     def __repr__(self) -> str:
-        return type(self).__name__ + f"(dtype={self.dtype}, device='{self.device!s}')"
+        return (
+            type(self).__name__
+            + f"(dtype={self.dtype}, device='{self.device!s}', pin_memory={self.pin_memory})"
+        )
 
 
 class ResampleImage(ItemwiseTransform, Module):
@@ -279,9 +325,8 @@ class ResampleImage(ItemwiseTransform, Module):
         self.spacing = spacing
         self.mode = Sampling(mode)
 
+    @_require_image
     def forward(self, image: Image) -> Image:
-        if not isinstance(image, Image):
-            raise TypeError(f"{type(self).__name__}.forward() argument must be Image")
         image = image.resample(self.spacing, mode=self.mode)
         return image
 
@@ -315,14 +360,19 @@ class RescaleImage(ItemwiseTransform, Module):
             self.mul = None
             self.add = None
 
+    @_require_image
     def forward(self, image: Image) -> Image:
-        if not isinstance(image, Image):
-            raise TypeError(f"{type(self).__name__}.forward() argument must be Image")
         if self.mul is not None or self.add is not None:
             assert self.min is None and self.max is None
-            if self.mul != 1:
+            if self.mul == 1 and self.add == 0:
+                return image
+            if self.mul != 1 and self.add != 0:
+                # Add in-place to the freshly allocated product such that the image
+                # data is copied only once instead of once per elementary operation.
+                image = image.mul(self.mul).add_(self.add)
+            elif self.mul != 1:
                 image = image.mul(self.mul)
-            if self.add != 0:
+            elif self.add != 0:
                 image = image.add(self.add)
         else:
             image = image.rescale(min=self.min, max=self.max)
@@ -349,9 +399,8 @@ class ResizeImage(ItemwiseTransform, Module):
         self.size = size
         self.mode = Sampling(mode)
 
+    @_require_image
     def forward(self, image: Image) -> Image:
-        if not isinstance(image, Image):
-            raise TypeError(f"{type(self).__name__}.forward() argument must be Image")
         image = image.resize(self.size, mode=self.mode)
         return image
 
@@ -359,6 +408,62 @@ class ResizeImage(ItemwiseTransform, Module):
         return type(self).__name__ + f"(size={self.size!r}, mode={self.mode.value!r})"
 
 
+class FusedIntensityTransform(ItemwiseTransform, Module):
+    r"""Apply consecutive intensity-only image transforms in a single pass.
+
+    Consecutive clamp, normalize, and rescale transforms each read and write the full image
+    buffer. This transform copies the image data at most once and applies all subsequent
+    operations in place, reducing the memory traffic of the fused section to a single
+    read-modify-write pass. The input image is never modified.
+
+    """
+
+    def __init__(self, transforms: Sequence[Module]) -> None:
+        super().__init__()
+        for transform in transforms:
+            if not isinstance(transform, (ClampImage, NormalizeImage, RescaleImage)):
+                raise TypeError(
+                    f"{type(self).__name__}() 'transforms' must be ClampImage,"
+                    " NormalizeImage, or RescaleImage instances"
+                )
+        self.transforms = ModuleList(transforms)
+
+    @_require_image
+    def forward(self, image: Image) -> Image:
+        copied = False
+        for transform in self.transforms:
+            if isinstance(transform, ClampImage):
+                if transform.min is None and transform.max is None:
+                    continue
+                clamp_fn = image.clamp_ if copied else image.clamp
+                image = clamp_fn(transform.min, transform.max)
+            elif isinstance(transform, NormalizeImage):
+                normalize_fn = image.normalize_ if copied else image.normalize
+                image = normalize_fn(mode=transform.mode, min=transform.min, max=transform.max)
+            elif transform.mul is not None or transform.add is not None:
+                mul, add = transform.mul, transform.add
+                if mul == 1 and add == 0:
+                    continue
+                if copied:
+                    if mul != 1:
+                        image = image.mul_(mul)
+                    if add != 0:
+                        image = image.add_(add)
+                elif mul != 1 and add != 0:
+                    image = image.mul(mul).add_(add)
+                elif mul != 1:
+                    image = image.mul(mul)
+                else:
+                    image = image.add(add)
+            else:
+                image = image.rescale(min=transform.min, max=transform.max)
+            copied = True
+        return image
+
+    def __repr__(self) -> str:
+        return type(self).__name__ + "(" + ", ".join(repr(t) for t in self.transforms) + ")"
+
+
 ImageTransformMapping = Mapping[str, Union[Sequence, Mapping]]
 ImageTransformConfig = Union[
     str, ImageTransformMapping, Sequence[Union[str, ImageTransformMapping]]
@@ -381,24 +486,38 @@ IMAGE_TRANSFORM_TYPES = {
 
 INPLACE_IMAGE_TRANSFORMS = {"clamp"}
 
+# Common spellings of the "read" transform name, checked before falling back to
+# str.lower() which allocates a new string for every queried config entry.
+_READ_TRANSFORM_NAMES = frozenset(("read", "Read", "READ"))
+
+
+def _is_read_image_transform(name: str) -> bool:
+    r"""Whether given image transform name refers to the "read" image transform."""
+    return name in _READ_TRANSFORM_NAMES or name.lower() == "read"
+
 
 def config_has_read_image_transform(config: ImageTransformConfig) -> bool:
     r"""Whether image data transformation configuration contains a "read" image transform."""
     if isinstance(config, str):
-        return config.lower() == "read"
+        return _is_read_image_transform(config)
     if isinstance(config, Mapping):
-        for name in config:
-            if name.lower() == "read":
-                return True
-        return False
+        return any(_is_read_image_transform(name) for name in config)
     if isinstance(config, Sequence):
         for item in config:
-            if isinstance(item, Sequence) and not isinstance(item, str):
+            if isinstance(item, str):
+                if _is_read_image_transform(item):
+                    return True
+            elif isinstance(item, Mapping):
+                if any(_is_read_image_transform(name) for name in item):
+                    return True
+            elif isinstance(item, Sequence):
                 raise ValueError(
                     "config_has_read_image_transform() 'config' Sequence cannot be nested"
                 )
-            if config_has_read_image_transform(item):
-                return True
+            else:
+                raise TypeError(
+                    "config_has_read_image_transform() 'config' must be str, Mapping, or Sequence"
+                )
         return False
     raise TypeError("config_has_read_image_transform() 'config' must be str, Mapping, or Sequence")
 
@@ -425,7 +544,8 @@ def image_transform(
     name: str, *args, key: Optional[str] = None, inplace: bool = True, **kwargs
 ) -> ItemwiseTransform:
     r"""Create image data transform given its name."""
-    cls = IMAGE_TRANSFORM_TYPES.get(name.lower())
+    name = name.lower()
+    cls = IMAGE_TRANSFORM_TYPES.get(name)
     if cls is None:
         raise ValueError(f"image_transform() unknown image data transform '{name}'")
     if name in INPLACE_IMAGE_TRANSFORMS:
@@ -436,27 +556,116 @@ def image_transform(
     return transform
 
 
-def image_transforms(config: ImageTransformConfig, key: Optional[str] = None) -> List[Module]:
-    r"""Create image data transforms from configuration."""
-    transforms = []
+def _freeze_config(config: ImageTransformConfig):
+    r"""Convert image transform configuration to a hashable representation."""
+    if isinstance(config, str):
+        return config
+    if isinstance(config, Mapping):
+        return tuple((name, _freeze_config(value)) for name, value in config.items())
+    if isinstance(config, Sequence):
+        return tuple(_freeze_config(item) for item in config)
+    return config
+
+
+def _image_transform_factories(
+    config: ImageTransformConfig, key: Optional[str]
+) -> Sequence[partial]:
+    r"""Resolve image transform configuration to zero-arg transform factories."""
+    factories = []
     if isinstance(config, str):
-        transforms.append(image_transform(config, key=key))
+        factories.append(partial(image_transform, config, key=key))
     elif isinstance(config, Mapping):
         for name, value in config.items():
             if value is None:
-                transform = image_transform(name, key=key)
+                factory = partial(image_transform, name, key=key)
             elif isinstance(value, (list, tuple)):
-                transform = image_transform(name, *value, key=key)
+                factory = partial(image_transform, name, *value, key=key)
             elif isinstance(value, Mapping):
-                transform = image_transform(name, key=key, **value)
+                factory = partial(image_transform, name, key=key, **value)
             else:
-                transform = image_transform(name, value, key=key)
-            transforms.append(transform)
+                factory = partial(image_transform, name, value, key=key)
+            factories.append(factory)
     elif isinstance(config, Sequence):
         for item in config:
             if isinstance(item, Sequence) and not isinstance(item, str):
                 raise ValueError("image_transform() 'config' Sequence cannot be nested")
-            transforms.extend(image_transforms(item, key=key))
+            factories.extend(_image_transform_factories(item, key))
     else:
         raise TypeError("image_transforms() 'config' must be str, Mapping, or Sequence")
-    return transforms
+    return tuple(factories)
+
+
+_COMPILED_IMAGE_TRANSFORMS = {}
+
+
+def compile_image_transforms(
+    config: ImageTransformConfig, key: Optional[str] = None
+) -> Sequence[partial]:
+    r"""Resolve image transform configuration once and cache the transform factories.
+
+    The returned factories construct a new transform instance per call such that repeated
+    ``image_transforms()`` calls with the same configuration (e.g., once per dataset item)
+    skip the configuration traversal and name resolution, but do not share module state.
+
+    """
+    cache_key = (key, _freeze_config(config))
+    try:
+        return _COMPILED_IMAGE_TRANSFORMS[cache_key]
+    except KeyError:
+        pass
+    except TypeError:
+        cache_key = None  # configuration contains unhashable values
+    factories = _image_transform_factories(config, key)
+    if cache_key is not None:
+        _COMPILED_IMAGE_TRANSFORMS[cache_key] = factories
+    return factories
+
+
+_FUSABLE_IMAGE_TRANSFORMS = (ClampImage, NormalizeImage, RescaleImage)
+
+
+def _fuse_image_transforms(transforms: List[Module]) -> List[Module]:
+    r"""Fuse groups of consecutive intensity-only transforms into single-pass transforms."""
+    result: List[Module] = []
+    group: List[Module] = []
+    group_params = None
+
+    def flush() -> None:
+        if len(group) > 1:
+            transform = FusedIntensityTransform([inner for _, inner in group])
+            if group_params is not None:
+                transform = ItemTransform(
+                    transform,
+                    key=group_params[0],
+                    copy=group_params[1],
+                    ignore_meta=group_params[2],
+                    ignore_missing=group_params[3],
+                )
+            result.append(transform)
+        else:
+            result.extend(original for original, _ in group)
+        group.clear()
+
+    for transform in transforms:
+        if isinstance(transform, ItemTransform):
+            inner = transform.transform
+            params = (transform.key, transform.copy, transform.ignore_meta, transform.ignore_missing)
+        else:
+            inner = transform
+            params = None
+        if isinstance(inner, _FUSABLE_IMAGE_TRANSFORMS):
+            if group and params != group_params:
+                flush()
+            group_params = params
+            group.append((transform, inner))
+        else:
+            flush()
+            result.append(transform)
+    flush()
+    return result
+
+
+def image_transforms(config: ImageTransformConfig, key: Optional[str] = None) -> List[Module]:
+    r"""Create image data transforms from configuration."""
+    transforms = [factory() for factory in compile_image_transforms(config, key=key)]
+    return _fuse_image_transforms(transforms)
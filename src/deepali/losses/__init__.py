@@ -12,8 +12,8 @@ The following import statement can be used to access the functional API:
 
 """
 
-import sys
-from typing import Any
+from functools import lru_cache
+from typing import Any, Dict
 
 from torch.nn import Module
 
@@ -75,7 +75,7 @@ __all__ = (
     "ClosestPointDistance",
     "CPD",
     "Curvature",
-    "Dice"
+    "Dice",
     "Diffusion",
     "DSC",
     "Elasticity",
@@ -100,6 +100,12 @@ __all__ = (
 )
 
 
+# Loss classes by name for direct lookup instead of a module attribute search
+_LOSS_REGISTRY: Dict[str, type] = {
+    name: obj for name, obj in globals().items() if isinstance(obj, type) and issubclass(obj, Module)
+}
+
+
 def is_pairwise_image_loss(arg: Any) -> bool:
     r"""Check if given argument is name or instance of pairwise image loss."""
     return is_loss_of_type(PairwiseImageLoss, arg)
@@ -117,21 +123,22 @@ def is_pointset_distance(arg: Any) -> bool:
 
 def is_loss_of_type(base, arg: Any) -> bool:
     r"""Check if given argument is name or instance of pairwise image loss."""
-    cls = None
-    if isinstance(arg, str):
-        cls = getattr(sys.modules[__name__], arg, None)
-    elif type(arg) is type:
+    if arg is None:
+        return False
+    cls = type(arg)
+    if cls is str:
+        cls = _LOSS_REGISTRY.get(arg)
+        if cls is None:
+            return False
+    elif cls is type:
         cls = arg
-    elif arg is not None:
-        cls = type(arg)
-    if cls is not None:
-        bases = list(cls.__bases__)
-        while bases:
-            b = bases.pop()
-            if b is base:
-                return True
-            bases.extend(b.__bases__)
-    return False
+    return _is_strict_subclass(cls, base)
+
+
+@lru_cache(maxsize=None)
+def _is_strict_subclass(cls: type, base: type) -> bool:
+    r"""Check if first class is a proper subclass of second, with memoized result."""
+    return cls is not base and issubclass(cls, base)
 
 
 def new_loss(name: str, *args, **kwargs) -> Module:
@@ -146,7 +153,7 @@ def new_loss(name: str, *args, **kwargs) -> Module:
         New loss module.
 
     """
-    cls = getattr(sys.modules[__name__], name, None)
+    cls = _LOSS_REGISTRY.get(name)
     if cls is None:
         raise ValueError(f"new_loss() unknown loss {name}")
     if cls is Module or not issubclass(cls, Module):
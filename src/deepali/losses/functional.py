@@ -543,21 +543,27 @@ def lcc_loss(
 
     """
 
+    if not torch.is_tensor(input):
+        raise TypeError("lcc_loss() 'input' must be tensor")
+    if not torch.is_tensor(target):
+        raise TypeError("lcc_loss() 'target' must be tensor")
+    if input.shape != target.shape:
+        raise ValueError("lcc_loss() 'input' must have same shape as 'target'")
+
+    # Resolve invariant pooling parameters once instead of per avg_pool() call
+    if isinstance(kernel_size, int):
+        kernel_size = (kernel_size,) * (input.ndim - 2)
+    padding = tuple(n // 2 for n in kernel_size)
+
     def pool(data: Tensor) -> Tensor:
         return avg_pool(
             data,
             kernel_size=kernel_size,
             stride=1,
-            padding=None,
+            padding=padding,
             count_include_pad=False,
         )
 
-    if not torch.is_tensor(input):
-        raise TypeError("lcc_loss() 'input' must be tensor")
-    if not torch.is_tensor(target):
-        raise TypeError("lcc_loss() 'target' must be tensor")
-    if input.shape != target.shape:
-        raise ValueError("lcc_loss() 'input' must have same shape as 'target'")
     input = input.float()
     target = target.float()
     x = input - pool(input)
@@ -653,6 +659,7 @@ def mi_loss(
     num_samples: Optional[int] = None,
     sample_ratio: Optional[float] = None,
     normalized: bool = False,
+    bin_center: Optional[Tensor] = None,
 ) -> Tensor:
     r"""Calculate mutual information loss using Parzen window density and entropy estimations.
 
@@ -671,6 +678,10 @@ def mi_loss(
             ignored if `sample_ratio` is also set.
         sample_ratio: Ratio of voxels in the image domain randomly sampled to compute the loss.
         normalized: Calculate Normalized Mutual Information instead of Mutual Information if True.
+        bin_center: Precomputed histogram bin centers as tensor of shape ``(num_bins, 1)``,
+            e.g., cached by a loss module with fixed ``vmin``, ``vmax``, and ``num_bins``.
+            If specified, ``num_bins`` is ignored and both ``vmin`` and ``vmax`` must be
+            the values used to construct the given bin centers.
 
     Returns:
         Negative mutual information. If ``normalized=True``, 2 is added such that the loss value is in [0, 1].
@@ -686,7 +697,11 @@ def mi_loss(
         vmin = torch.min(input.min(), target.min()).item()
     if vmax is None:
         vmax = torch.max(input.max(), target.max()).item()
-    if num_bins is None:
+    if bin_center is not None:
+        if bin_center.ndim != 2 or bin_center.shape[1] != 1:
+            raise ValueError("mi_loss() 'bin_center' must be tensor of shape (num_bins, 1)")
+        num_bins = bin_center.shape[0]
+    elif num_bins is None:
         num_bins = 64
     elif num_bins == "auto":
         raise NotImplementedError("mi_loss() automatically setting num_bins based on dynamic range of input")
@@ -718,8 +733,9 @@ def mi_loss(
 
     # set the bin edges and Gaussian kernel std
     bin_width = (vmax - vmin) / num_bins  # FWHM is one bin width
-    bin_center = torch.linspace(vmin, vmax, num_bins, requires_grad=False)
-    bin_center = bin_center.unsqueeze(1).type_as(input)
+    if bin_center is None:
+        bin_center = torch.linspace(vmin, vmax, num_bins, requires_grad=False).unsqueeze(1)
+    bin_center = bin_center.type_as(input)
 
     # calculate Parzen window function response
     pw_sdev = bin_width * (1 / (2 * math.sqrt(2 * math.log(2))))
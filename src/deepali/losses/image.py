@@ -1,7 +1,9 @@
 r"""Image dissimilarity measures."""
 
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 
+import torch
 from torch import Tensor
 
 from ..core import functional as U
@@ -71,6 +73,49 @@ class MSE(NormalizedPairwiseImageLoss):
         return L.mse_loss(source, target, mask=mask, norm=self.norm)
 
 
+@lru_cache(maxsize=64)
+def _validate_mi_args(
+    name: str,
+    bins: Optional[int],
+    sample: Optional[float],
+    num_bins: Optional[int],
+    num_samples: Optional[int],
+    sample_ratio: Optional[float],
+) -> Tuple[Optional[int], Optional[int], Optional[float]]:
+    r"""Validate and normalize MI loss sampling arguments, with memoized result.
+
+    Returns:
+        Tuple of normalized ``(num_bins, num_samples, sample_ratio)`` arguments.
+
+    """
+    if bins is not None:
+        if num_bins is not None:
+            raise ValueError(f"{name}() 'bins' and 'num_bins' are mutually exclusive")
+        num_bins = bins
+
+    if sample is not None:
+        if sample_ratio is not None or num_samples is not None:
+            raise ValueError(
+                f"{name}() 'sample', 'sample_ratio', and 'num_samples' are mutually exclusive"
+            )
+        if 0 < sample < 1:
+            sample_ratio = float(sample)
+        else:
+            try:
+                num_samples = int(sample)
+            except TypeError:
+                pass
+            if num_samples is None or float(num_samples) != sample:
+                raise ValueError(f"{name}() 'sample' must be float in (0, 1) or positive int")
+    if num_samples == -1:
+        num_samples = None
+    if num_samples is not None and (not isinstance(num_samples, int) or num_samples <= 0):
+        raise ValueError(f"{name}() 'num_samples' must be positive integral value")
+    if sample_ratio is not None and (sample_ratio <= 0 or sample_ratio >= 1):
+        raise ValueError(f"{name}() 'sample_ratio' must be in closed interval [0, 1]")
+    return num_bins, num_samples, sample_ratio
+
+
 class MI(PairwiseImageLoss):
     r"""Mutual information loss using Parzen window estimate with Gaussian kernel."""
 
@@ -90,41 +135,9 @@ class MI(PairwiseImageLoss):
         See `deepali.losses.functional.mi_loss`.
 
         """
-
-        if bins is not None:
-            if num_bins is not None:
-                raise ValueError(
-                    f"{type(self).__name__}() 'bins' and 'num_bins' are mutually exclusive"
-                )
-            num_bins = bins
-
-        if sample is not None:
-            if sample_ratio is not None or num_samples is not None:
-                raise ValueError(
-                    f"{type(self).__name__}() 'sample', 'sample_ratio', and 'num_samples' are mutually exclusive"
-                )
-            if 0 < sample < 1:
-                sample_ratio = float(sample)
-            else:
-                try:
-                    num_samples = int(sample)
-                except TypeError:
-                    pass
-                if num_samples is None or float(num_samples) != sample:
-                    raise ValueError(
-                        f"{type(self).__name__}() 'sample' must be float in (0, 1) or positive int"
-                    )
-        if num_samples == -1:
-            num_samples = None
-        if num_samples is not None and (not isinstance(num_samples, int) or num_samples <= 0):
-            raise ValueError(
-                f"{type(self).__name__}() 'num_samples' must be positive integral value"
-            )
-        if sample_ratio is not None and (sample_ratio <= 0 or sample_ratio >= 1):
-            raise ValueError(
-                f"{type(self).__name__}() 'sample_ratio' must be in closed interval [0, 1]"
-            )
-
+        num_bins, num_samples, sample_ratio = _validate_mi_args(
+            type(self).__name__, bins, sample, num_bins, num_samples, sample_ratio
+        )
         super().__init__()
         self.vmin = vmin
         self.vmax = vmax
@@ -132,6 +145,9 @@ class MI(PairwiseImageLoss):
         self.num_samples = num_samples
         self.sample_ratio = sample_ratio
         self._normalized = normalized
+        # Histogram bin centers are invariant when intensity range is fixed and
+        # thus computed once on first use instead of on every loss evaluation.
+        self.register_buffer("_bin_center", None, persistent=False)
 
     @property
     def bins(self) -> int:
@@ -143,6 +159,11 @@ class MI(PairwiseImageLoss):
 
     def forward(self, source: Tensor, target: Tensor, mask: Optional[Tensor] = None) -> Tensor:
         r"""Evaluate patch dissimilarity loss."""
+        bin_center = self._bin_center
+        if bin_center is None and self.vmin is not None and self.vmax is not None:
+            num_bins = 64 if self.num_bins is None else self.num_bins
+            bin_center = torch.linspace(self.vmin, self.vmax, num_bins).unsqueeze(1)
+            self._bin_center = bin_center
         return L.mi_loss(
             source,
             target,
@@ -153,6 +174,7 @@ class MI(PairwiseImageLoss):
             num_samples=self.num_samples,
             sample_ratio=self.sample_ratio,
             normalized=self.normalized,
+            bin_center=bin_center,
         )
 
     def extra_repr(self) -> str:
@@ -204,6 +226,31 @@ class NMI(MI):
         )
 
 
+def _sample_patches(data: Tensor, patches: Tensor, flat: bool) -> Tensor:
+    r"""Sample 2D patches such that each patch is a separate image of shape (N * Z, C, 1, Y, X) in the batch.
+
+    When ``flat=True``, the given ``patches`` already store one patch per batch entry
+    and the sampled tensor has the desired layout without further rearrangement.
+
+    """
+    x = U.grid_sample(data, patches)
+    if flat:
+        return x
+    N, C, Z, Y, X = x.shape
+    x = x.permute(0, 2, 1, 3, 4)  # N, Z, C, Y, X
+    x = x.reshape(N * Z, C, 1, Y, X)
+    return x
+
+
+if hasattr(torch, "compile"):
+    # Compiled variant used on CUDA, where Inductor fuses grid_sample, permute,
+    # and reshape and avoids materialization of the intermediate sampled tensor.
+    # The eager function remains in use on CPU to avoid compilation latency there.
+    _sample_patches_compiled = torch.compile(_sample_patches, dynamic=True, fullgraph=False)
+else:
+    _sample_patches_compiled = _sample_patches
+
+
 class PatchwiseImageLoss(PairwiseImageLoss):
     r"""Pairwise similarity of 2D image patches defined within a 3D volume."""
 
@@ -220,7 +267,14 @@ class PatchwiseImageLoss(PairwiseImageLoss):
             raise TypeError("PatchwiseImageLoss() 'patches' must be Tensor")
         if not patches.ndim == 5 or patches.shape[-1] != 3:
             raise ValueError("PatchwiseImageLoss() 'patches' must have shape (N, Z, Y, X, 3)")
-        self.patches = patches
+        self.register_buffer("patches", patches.contiguous(), persistent=False)
+        # Flattened patch points with one patch per batch entry. Sampling a single
+        # input image with these yields the (N * Z, C, 1, Y, X) patch layout directly,
+        # without the contiguous copy of a subsequent permute and reshape.
+        N, Z, Y, X = patches.shape[:4]
+        self.register_buffer(
+            "_flat_patches", self.patches.view(N * Z, 1, Y, X, 3), persistent=False
+        )
         self.loss_fn = loss_fn
 
     def forward(self, source: Tensor, target: Tensor, mask: Optional[Tensor] = None) -> Tensor:
@@ -233,14 +287,19 @@ class PatchwiseImageLoss(PairwiseImageLoss):
             raise ValueError(
                 "PatchwiseImageLoss.forward() 'source' must have same shape as 'target'"
             )
+        flat = source.shape[0] == 1
+        patches = self._flat_patches if flat else self.patches
         if mask is not None:
             if mask.shape != target.shape:
                 raise ValueError(
                     "PatchwiseImageLoss.forward() 'mask' must have same shape as 'target'"
                 )
-            mask = self._reshape(U.grid_sample_mask(mask, self.patches))
-        source = self._reshape(U.grid_sample(source, self.patches))
-        target = self._reshape(U.grid_sample(target, self.patches))
+            mask = U.grid_sample_mask(mask, patches)
+            if not flat:
+                mask = self._reshape(mask)
+        sample_patches = _sample_patches_compiled if source.is_cuda else _sample_patches
+        source = sample_patches(source, patches, flat)
+        target = sample_patches(target, patches, flat)
         return self.loss_fn(source, target, mask=mask)
 
     @staticmethod
@@ -2,7 +2,6 @@ r"""Modules operating on flow vector fields."""
 
 from __future__ import annotations
 
-from copy import copy as shallow_copy
 from typing import Optional
 
 from torch import Tensor
@@ -55,9 +54,7 @@ class ExpFlow(Module):
 
     def inverse(self) -> ExpFlow:
         r"""Get inverse exponential map."""
-        copy = shallow_copy(self)
-        copy.scale *= -1
-        return copy
+        return ExpFlow(scale=-self.scale, steps=self.steps, align_corners=self.align_corners)
 
     def extra_repr(self) -> str:
         return f"scale={repr(self.scale)}, steps={repr(self.steps)}"
@@ -1,7 +1,8 @@
 r"""Modules for sampling of image data, e.g., after spatial transformation."""
 
-from typing import Dict, Mapping, Optional, Tuple, Union, cast, overload
+from typing import Callable, Dict, Mapping, Optional, Sequence, Tuple, Union, cast, overload
 
+import torch
 from torch import Tensor
 from torch.nn import Module
 
@@ -9,7 +10,65 @@ from ..core import functional as U
 from ..core.enum import PaddingMode, Sampling
 from ..core.grid import Axes, Grid, grid_points_transform
 from ..core.linalg import homogeneous_matmul, homogeneous_transform
-from ..core.types import Scalar
+from ..core.types import DType, Scalar
+
+
+# Tensors cached across instances constructed with equivalent grids, keyed by
+# the grid attribute values such that equal grid domains share one entry.
+_CACHE_MAXSIZE = 32
+_MATRIX_CACHE: Dict[tuple, Tensor] = {}
+_POINTS_CACHE: Dict[tuple, Tensor] = {}
+
+
+def _grid_cache_key(grid: Grid) -> tuple:
+    r"""Hashable key derived from the attribute values of a sampling grid."""
+    return (
+        grid.dtype,
+        str(grid.device),
+        tuple(grid.size()),
+        tuple(grid.center().tolist()),
+        tuple(grid.spacing().tolist()),
+        tuple(grid.direction().flatten().tolist()),
+        grid.align_corners(),
+    )
+
+
+def _cached_tensor(cache: Dict[tuple, Tensor], key: tuple, fn: Callable[[], Tensor]) -> Tensor:
+    r"""Get tensor from cache, computing and storing it on first use."""
+    value = cache.get(key)
+    if value is None:
+        value = fn()
+        if len(cache) >= _CACHE_MAXSIZE:
+            cache.clear()
+        cache[key] = value
+    return value
+
+
+def _sample_data(
+    data: Tensor,
+    grid: Tensor,
+    mode: Union[Sampling, str],
+    padding: Union[PaddingMode, str, Scalar],
+    align_corners: bool,
+) -> Tensor:
+    r"""Sample image data at grid points."""
+    return U.grid_sample(data, grid, mode=mode, padding=padding, align_corners=align_corners)
+
+
+def _sample_mask(mask: Tensor, grid: Tensor, align_corners: bool) -> Tensor:
+    r"""Sample binary mask at grid points and threshold interpolated values."""
+    return U.grid_sample_mask(mask, grid, align_corners=align_corners) > 0.9
+
+
+if hasattr(torch, "compile"):
+    # Compiled variants used on CUDA, where Inductor fuses the padding arithmetic
+    # and mask thresholding with the sampling kernel and saves kernel launches.
+    # The eager functions remain in use on CPU to avoid compilation latency there.
+    _sample_data_compiled = torch.compile(_sample_data, dynamic=True, fullgraph=False)
+    _sample_mask_compiled = torch.compile(_sample_mask, dynamic=True, fullgraph=False)
+else:
+    _sample_data_compiled = _sample_data
+    _sample_mask_compiled = _sample_mask
 
 
 class SampleImage(Module):
@@ -23,6 +82,7 @@ class SampleImage(Module):
         sampling: Optional[Union[Sampling, str]] = None,
         padding: Optional[Union[PaddingMode, str, Scalar]] = None,
         align_centers: bool = False,
+        grid_dtype: Optional[DType] = None,
     ):
         r"""Initialize base class.
 
@@ -36,9 +96,21 @@ class SampleImage(Module):
             align_centers: Whether to implicitly align the ``target`` and ``source`` centers.
                 If ``True``, only the affine component of the target to source transformation
                 is applied. If ``False``, also the translation of grid center points is considered.
+            grid_dtype: Floating point data type in which to store and sample grid points,
+                e.g., ``torch.bfloat16`` to reduce memory traffic of the sampling operation.
+                Normalized cube coordinates in ``[-1, 1]`` generally require less precision
+                than image intensities. If ``None``, grid points are kept at their own dtype.
 
         """
         super().__init__()
+        # Cached for error messages such that the hot path avoids repeated type() lookups
+        self._cls_name = type(self).__name__
+        if grid_dtype is not None:
+            if not isinstance(grid_dtype, torch.dtype):
+                raise TypeError(f"{self._cls_name}() 'grid_dtype' must be torch.dtype")
+            if not grid_dtype.is_floating_point:
+                raise ValueError(f"{self._cls_name}() 'grid_dtype' must be floating point dtype")
+        self._grid_dtype = grid_dtype
         self._target = target
         self._source = source or target
         if axes is None:
@@ -50,8 +122,31 @@ class SampleImage(Module):
         else:
             self._padding = float(padding)
         self._align_centers = bool(align_centers)
+        # Cached since the matrix computed below is only valid for this setting anyway
+        self._align_corners = bool(self._target.align_corners())
         # Precompute target points to source cube transformation **AFTER** attributes are set!
-        self.register_buffer("matrix", self._matrix())
+        key = (
+            _grid_cache_key(self._target),
+            _grid_cache_key(self._source),
+            self._axes,
+            self._align_centers,
+        )
+        matrix = _cached_tensor(_MATRIX_CACHE, key, self._matrix)
+        if grid_dtype is not None:
+            matrix = matrix.to(grid_dtype)
+        # Own copy such that loading a state dict cannot modify the shared tensor
+        self.register_buffer("matrix", matrix.clone())
+        # When target and source grids coincide, the matrix reduces to the identity
+        # and transforming the grid points by it can be skipped entirely.
+        D = matrix.shape[1]
+        eye = torch.eye(D, matrix.shape[2], dtype=matrix.dtype, device=matrix.device)
+        self._is_identity = bool(torch.allclose(matrix.squeeze(0), eye))
+        # Optional fixed order of input dict modalities for fused channel sampling
+        self._modalities: Optional[Tuple[str, ...]] = None
+        # Scratch buffer for transformed grid points, lazily allocated on first use.
+        # The transformed points are consumed by the sampling operation within the
+        # same forward call and thus the allocation can be reused across calls.
+        self._grid_buf: Optional[Tensor] = None
 
     def axes(self) -> Axes:
         r"""Axes with respect to which target grid points and transformations thereof are defined."""
@@ -87,11 +182,46 @@ class SampleImage(Module):
 
     def align_corners(self) -> bool:
         r"""Whether to sample images using ``align_corners=False`` or ``align_corners=True``."""
-        return self._target.align_corners()
+        return self._align_corners
+
+    def grid_dtype(self) -> Optional[DType]:
+        r"""Floating point data type of grid points used for sampling, if specified."""
+        return self._grid_dtype
+
+    def modalities(self) -> Optional[Tuple[str, ...]]:
+        r"""Fixed order of input dict modalities for fused channel sampling, if set."""
+        return self._modalities
+
+    def set_modalities(self, keys: Sequence[str]) -> "SampleImage":
+        r"""Set fixed order of image modalities sampled from an input dict.
+
+        When set and the non-mask keys of an input dict match this order, the dict
+        values are concatenated along the channel dimension, sampled by a single
+        interpolation, and split again, instead of being grouped by tensor layout
+        on every call. All modality tensors must thus have the same batch size,
+        spatial shape, data type, and device.
+
+        Args:
+            keys: Names of input dict entries other than "mask" in a fixed order.
+
+        Returns:
+            Reference to this module.
+
+        """
+        keys = tuple(keys)
+        for key in keys:
+            if not isinstance(key, str):
+                raise TypeError(f"{type(self).__name__}.set_modalities() 'keys' must be str")
+        if "mask" in keys:
+            raise ValueError(
+                f"{type(self).__name__}.set_modalities() 'keys' must not contain 'mask'"
+            )
+        self._modalities = keys
+        return self
 
     def _matrix(self) -> Tensor:
         r"""Homogeneous coordinate transformation from target grid points to source grid cube."""
-        align_corners = self.align_corners()
+        align_corners = self._align_corners
         to_axes = Axes.from_align_corners(align_corners)
         matrix = grid_points_transform(self._target, self._axes, self._source, to_axes)
         if self._align_centers:
@@ -101,84 +231,143 @@ class SampleImage(Module):
 
     def _transform_target_to_source(self, grid: Tensor) -> Tensor:
         r"""Transform target grid points to source cube."""
+        if self._is_identity:
+            return grid
         matrix = cast(Tensor, self.matrix)
-        return homogeneous_transform(matrix, grid)
-
-    def _sample_source_image(
+        if torch.is_grad_enabled():
+            # Even when the grid itself does not require gradients, the sampling
+            # operation may save the transformed points for the backward pass of
+            # its image data input, which an in-place reused buffer would corrupt.
+            return homogeneous_transform(matrix, grid)
+        buf = self._grid_buf
+        if (
+            buf is None
+            or buf.shape != grid.shape
+            or buf.dtype != grid.dtype
+            or buf.device != grid.device
+        ):
+            buf = torch.empty(grid.shape, dtype=grid.dtype, device=grid.device)
+            self._grid_buf = buf
+        return homogeneous_transform(matrix, grid, out=buf)
+
+    def _validate_inputs(
         self,
         grid: Tensor,
-        input: Optional[Union[Tensor, Mapping[str, Tensor]]] = None,
-        data: Optional[Tensor] = None,
-        mask: Optional[Tensor] = None,
-    ) -> Union[Tensor, Tuple[Tensor, Tensor], Dict[str, Tensor]]:
-        r"""Sample images at specified source grid points."""
-        source = {}
-        output = {}
+        input: Optional[Union[Tensor, Mapping[str, Tensor]]],
+        data: Optional[Tensor],
+        mask: Optional[Tensor],
+    ) -> None:
+        r"""Check types and shapes of sampling inputs.
+
+        Invoked by ``_sample_source_image`` only when ``__debug__`` is set, such that
+        running the interpreter with ``-O`` strips the per-call input validation.
+
+        """
+        name = self._cls_name
         shape = None
-        align_corners = self.align_corners()
         if not isinstance(grid, Tensor):
-            raise TypeError(f"{type(self).__name__}() 'grid' must be Tensor")
+            raise TypeError(f"{name}() 'grid' must be Tensor")
         if isinstance(input, dict):
             if data is not None or mask is not None:
-                raise ValueError(
-                    f"{type(self).__name__}() 'input' dict and 'data'/'mask' are mutually exclusive"
-                )
-            for data in input.values():
-                if not isinstance(data, Tensor):
-                    raise TypeError(f"{type(self).__name__}() 'input' dict values must be Tensor")
-            source: Dict[str, Tensor] = {
-                name: data for name, data in input.items() if name != "mask"
-            }
-            shape = next(iter(source.values())).shape if source else None
+                raise ValueError(f"{name}() 'input' dict and 'data'/'mask' are mutually exclusive")
+            for value in input.values():
+                if not isinstance(value, Tensor):
+                    raise TypeError(f"{name}() 'input' dict values must be Tensor")
+            shape = next((value.shape for key, value in input.items() if key != "mask"), None)
             mask = input.get("mask")
         elif isinstance(input, Tensor):
             if data is not None:
-                raise ValueError(
-                    f"{type(self).__name__}() 'input' and 'data' are mutually exclusive"
-                )
-            source = {"data": input}
+                raise ValueError(f"{name}() 'input' and 'data' are mutually exclusive")
             shape = input.shape
         elif input is None:
             if data is None and mask is None:
-                raise ValueError(
-                    f"{type(self).__name__} 'input', 'data', and/or 'mask' is required"
-                )
+                raise ValueError(f"{name} 'input', 'data', and/or 'mask' is required")
         else:
-            raise TypeError(
-                f"{type(self).__name__}() 'input' must be Tensor or Mapping[str, Tensor]"
-            )
-        for name, data in source.items():
-            is_unbatched = data.ndim == grid.shape[-1] + 1
-            if is_unbatched:
-                data = data.unsqueeze(0)
-            data = U.grid_sample(
-                data,
-                grid,
-                mode=self._sampling,
-                padding=self._padding,
-                align_corners=align_corners,
-            )
-            if is_unbatched:
-                data = data.squeeze(0)
-            output[name] = data
+            raise TypeError(f"{name}() 'input' must be Tensor or Mapping[str, Tensor]")
         if mask is not None:
             if not isinstance(mask, Tensor):
-                raise TypeError(f"{type(self).__name__}() 'mask' must be Tensor")
+                raise TypeError(f"{name}() 'mask' must be Tensor")
             if shape is not None:
                 if mask.ndim != len(shape):
-                    raise ValueError(
-                        f"{type(self).__name__}() 'mask' must have same ndim as 'input' data"
-                    )
+                    raise ValueError(f"{name}() 'mask' must have same ndim as 'input' data")
                 if mask.shape[0] != shape[0]:
-                    raise ValueError(
-                        f"{type(self).__name__}() 'mask' must have same batch size as 'input' data"
-                    )
+                    raise ValueError(f"{name}() 'mask' must have same batch size as 'input' data")
                 if mask.shape[2:] != shape[2:]:
                     raise ValueError(
-                        f"{type(self).__name__}() 'mask' must have same spatial shape as 'input' data"
+                        f"{name}() 'mask' must have same spatial shape as 'input' data"
                     )
-            temp = U.grid_sample_mask(mask, grid, align_corners=align_corners)
-            output["mask"] = temp > 0.9
+
+    def _sample_source_image(
+        self,
+        grid: Tensor,
+        input: Optional[Union[Tensor, Mapping[str, Tensor]]] = None,
+        data: Optional[Tensor] = None,
+        mask: Optional[Tensor] = None,
+    ) -> Union[Tensor, Tuple[Tensor, Tensor], Dict[str, Tensor]]:
+        r"""Sample images at specified source grid points."""
+        if __debug__:
+            self._validate_inputs(grid, input, data, mask)
+        source: Dict[str, Tensor] = {}
+        output = {}
+        align_corners = self._align_corners
+        if self._grid_dtype is not None and grid.dtype != self._grid_dtype:
+            # grid_sample() interpolates in the dtype of the grid and casts the
+            # sampled values back to the data dtype, i.e., a reduced precision
+            # grid also reduces the memory traffic of the sampling operation.
+            grid = grid.to(self._grid_dtype)
+        if isinstance(input, dict):
+            source = {name: value for name, value in input.items() if name != "mask"}
+            mask = input.get("mask")
+        elif isinstance(input, Tensor):
+            source = {"data": input}
+        sample_data = _sample_data_compiled if grid.is_cuda else _sample_data
+        if self._modalities is not None and tuple(source) == self._modalities:
+            # Fused modality path with channel concatenation order fixed up front,
+            # skipping the per-call grouping of dict entries by tensor layout.
+            if len(source) == 1:
+                name = self._modalities[0]
+                data = sample_data(source[name], grid, self._sampling, self._padding, align_corners)
+                output[name] = data
+            else:
+                channels = [data.shape[1] for data in source.values()]
+                batch = torch.cat(list(source.values()), dim=1)
+                batch = sample_data(batch, grid, self._sampling, self._padding, align_corners)
+                for name, data in zip(source, batch.split(channels, dim=1)):
+                    output[name] = data
+        else:
+            # Group tensors with identical layout such that these are interpolated by a
+            # single grid_sample call, concatenated along the channel dimension. Tensors
+            # without batch dimension are classified once and sampled in batched mode.
+            groups: Dict[tuple, list] = {}
+            for name, data in source.items():
+                if data.ndim == grid.shape[-1] + 1:
+                    key = (None, data.shape[1:], data.dtype, data.device)
+                else:
+                    key = (data.shape[0], data.shape[2:], data.dtype, data.device)
+                groups.setdefault(key, []).append(name)
+            for key, names in groups.items():
+                is_unbatched = key[0] is None
+                dim = 0 if is_unbatched else 1
+                if len(names) == 1:
+                    batch = source[names[0]]
+                else:
+                    batch = torch.cat([source[name] for name in names], dim=dim)
+                if is_unbatched:
+                    batch = batch.unsqueeze(0)
+                batch = sample_data(batch, grid, self._sampling, self._padding, align_corners)
+                if is_unbatched:
+                    batch = batch.squeeze(0)
+                if len(names) == 1:
+                    output[names[0]] = batch
+                else:
+                    channels = [source[name].shape[dim] for name in names]
+                    for name, data in zip(names, batch.split(channels, dim=dim)):
+                        output[name] = data
+            if source:
+                output = {name: output[name] for name in source}
+        if mask is not None:
+            sample_mask = _sample_mask_compiled if grid.is_cuda else _sample_mask
+            output["mask"] = sample_mask(mask, grid, align_corners)
         if isinstance(input, dict):
             return output
         if data is None:
@@ -210,6 +399,45 @@ class SampleImage(Module):
         grid = self._transform_target_to_source(grid)
         return self._sample_source_image(grid, input=input, data=data, mask=mask)
 
+    def forward_channels(
+        self,
+        grid: Tensor,
+        channels: Tensor,
+        mask: Optional[Tensor] = None,
+    ) -> Tuple[Tensor, Optional[Tensor]]:
+        r"""Sample channel-stacked images at target grid points.
+
+        Unlike ``forward`` with an input dict, all image modalities must be pre-stacked
+        along the channel dimension such that these are sampled by a single interpolation
+        without any per-call dict manipulation. Use ``Tensor.split()`` to recover the
+        individual modalities from the returned tensor.
+
+        Args:
+            grid: Target grid points of shape ``(..., X, D)`` or ``(N, ..., X, D)``.
+            channels: Batch of channel-stacked images of shape ``(N, C, ..., X)``.
+            mask: Optional mask of shape ``(N, 1, ..., X)`` to sample at the same points.
+
+        Returns:
+            Tuple of sampled channels and sampled mask, where the latter is ``None``
+            if no ``mask`` was given.
+
+        """
+        if __debug__ and not isinstance(channels, Tensor):
+            raise TypeError(f"{self._cls_name}.forward_channels() 'channels' must be Tensor")
+        if grid.ndim == grid.shape[-1] + 1:
+            grid = grid.unsqueeze(0)
+        grid = self._transform_target_to_source(grid)
+        if self._grid_dtype is not None and grid.dtype != self._grid_dtype:
+            grid = grid.to(self._grid_dtype)
+        sample_data = _sample_data_compiled if grid.is_cuda else _sample_data
+        data = sample_data(channels, grid, self._sampling, self._padding, self._align_corners)
+        if mask is None:
+            return data, None
+        if __debug__ and not isinstance(mask, Tensor):
+            raise TypeError(f"{self._cls_name}.forward_channels() 'mask' must be Tensor")
+        sample_mask = _sample_mask_compiled if grid.is_cuda else _sample_mask
+        return data, sample_mask(mask, grid, self._align_corners)
+
     def extra_repr(self) -> str:
         return (
             f"target={repr(self._target)}"
@@ -237,6 +465,7 @@ class TransformImage(SampleImage):
         sampling: Union[Sampling, str] = Sampling.LINEAR,
         padding: Union[PaddingMode, str, Scalar] = PaddingMode.BORDER,
         align_centers: bool = False,
+        grid_dtype: Optional[DType] = None,
     ):
         r"""Initialize module.
 
@@ -250,6 +479,8 @@ class TransformImage(SampleImage):
             align_centers: Whether to implicitly align the ``target`` and ``source`` centers.
                 If ``True``, only the affine component of the target to source transformation
                 is applied. If ``False``, also the translation of grid center points is considered.
+            grid_dtype: Floating point data type in which to store and sample grid points.
+                See ``SampleImage`` for details. If ``None``, grid points keep their own dtype.
 
         """
         super().__init__(
@@ -259,12 +490,24 @@ class TransformImage(SampleImage):
             sampling=sampling,
             padding=padding,
             align_centers=align_centers,
+            grid_dtype=grid_dtype,
         )
         self.register_buffer("grid", self._grid(), persistent=False)
 
     def _grid(self) -> Tensor:
-        r"""Target grid points before spatial transformation."""
-        return self._target.points(self._axes).unsqueeze(0)
+        r"""Target grid points before spatial transformation.
+
+        The dense point tensor is shared between instances with equal target grid and axes,
+        which is safe because it is registered as non-persistent buffer and never modified.
+
+        """
+        key = (_grid_cache_key(self._target), self._axes)
+        points = _cached_tensor(
+            _POINTS_CACHE, key, lambda: self._target.points(self._axes).unsqueeze(0)
+        )
+        if self._grid_dtype is not None:
+            points = points.to(self._grid_dtype)
+        return points
 
     def forward(
         self,
@@ -278,7 +521,14 @@ class TransformImage(SampleImage):
         if isinstance(transform, Tensor):
             if transform.ndim == grid.shape[-1] + 1:
                 transform = transform.unsqueeze(0)
-            grid = U.transform_grid(transform, grid, align_corners=self.align_corners())
+            if transform.ndim == 3:
+                # Compose linear transform with target to source cube transform and apply
+                # the composite matrix in a single pass over the dense grid of points,
+                # instead of transforming all grid points once per transformation.
+                matrix = homogeneous_matmul(cast(Tensor, self.matrix), transform)
+                grid = homogeneous_transform(matrix, grid)
+                return self._sample_source_image(grid, input=input, data=data, mask=mask)
+            grid = U.transform_grid(transform, grid, align_corners=self._align_corners)
         elif transform is not None:
             raise TypeError("TransformImage() 'transform' must be Tensor")
         grid = self._transform_target_to_source(grid)
@@ -301,6 +551,7 @@ class AlignImage(SampleImage):
         sampling: Union[Sampling, str] = Sampling.LINEAR,
         padding: Union[PaddingMode, str, Scalar] = PaddingMode.BORDER,
         align_centers: bool = False,
+        grid_dtype: Optional[DType] = None,
     ):
         r"""Initialize module.
 
@@ -314,6 +565,8 @@ class AlignImage(SampleImage):
             align_centers: Whether to implicitly align the ``target`` and ``source`` centers.
                 If ``True``, only the affine component of the target to source transformation
                 is applied. If ``False``, also the translation of grid center points is considered.
+            grid_dtype: Floating point data type in which to store and sample grid points.
+                See ``SampleImage`` for details. If ``None``, grid points keep their own dtype.
 
         """
         super().__init__(
@@ -323,12 +576,31 @@ class AlignImage(SampleImage):
             sampling=sampling,
             padding=padding,
             align_centers=align_centers,
+            grid_dtype=grid_dtype,
         )
         self.register_buffer("grid", self._grid(), persistent=False)
+        # Precompute grid points mapped to the source cube such that sampling with
+        # transform=None skips the dense homogeneous_transform on every forward
+        if self._is_identity:
+            points = cast(Tensor, self.grid)
+        else:
+            points = homogeneous_transform(cast(Tensor, self.matrix), cast(Tensor, self.grid))
+        self.register_buffer("source_grid_points", points, persistent=False)
 
     def _grid(self) -> Tensor:
-        r"""Target grid points before spatial transformation."""
-        return self._target.points(self._axes).unsqueeze(0)
+        r"""Target grid points before spatial transformation.
+
+        The dense point tensor is shared between instances with equal target grid and axes,
+        which is safe because it is registered as non-persistent buffer and never modified.
+
+        """
+        key = (_grid_cache_key(self._target), self._axes)
+        points = _cached_tensor(
+            _POINTS_CACHE, key, lambda: self._target.points(self._axes).unsqueeze(0)
+        )
+        if self._grid_dtype is not None:
+            points = points.to(self._grid_dtype)
+        return points
 
     def forward(
         self,
@@ -338,13 +610,13 @@ class AlignImage(SampleImage):
         mask: Optional[Tensor] = None,
     ) -> Union[Tensor, Tuple[Tensor, Tensor], Dict[str, Tensor]]:
         r"""Sample batch of optionally masked images at linearly transformed target grid points."""
-        composite_transform = cast(Tensor, self.matrix)
-        if transform is not None:
-            if not isinstance(transform, Tensor):
-                raise TypeError("AlignImage() 'transform' must be Tensor")
-            if transform.ndim != 3:
-                raise ValueError("AlignImage() 'transform' must be 3-dimensional tensor")
-            composite_transform = homogeneous_matmul(composite_transform, transform)
-        grid = cast(Tensor, self.grid)
-        grid = homogeneous_transform(composite_transform, grid)
+        if transform is None:
+            grid = cast(Tensor, self.source_grid_points)
+            return self._sample_source_image(grid, input=input, data=data, mask=mask)
+        if not isinstance(transform, Tensor):
+            raise TypeError("AlignImage() 'transform' must be Tensor")
+        if transform.ndim != 3:
+            raise ValueError("AlignImage() 'transform' must be 3-dimensional tensor")
+        composite_transform = homogeneous_matmul(cast(Tensor, self.matrix), transform)
+        grid = homogeneous_transform(composite_transform, cast(Tensor, self.grid))
         return self._sample_source_image(grid, input=input, data=data, mask=mask)
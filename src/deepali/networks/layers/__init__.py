@@ -19,6 +19,9 @@ from .conv import ConvTranspose3d
 from .conv import ConvLayer
 from .conv import conv_module
 from .conv import convolution
+from .conv import deferred_conv_init
+from .conv import fuse_depthwise_separable
+from .conv import initialize_conv_weights
 from .conv import is_convolution
 from .conv import is_conv_module
 
@@ -73,6 +76,9 @@ __all__ = (
     "ConvLayer",
     "conv_module",
     "convolution",
+    "deferred_conv_init",
+    "fuse_depthwise_separable",
+    "initialize_conv_weights",
     "is_convolution",
     "is_conv_module",
     # Merge network branches
@@ -57,6 +57,13 @@ INPLACE_ACTIVATIONS = {
 
 SOFTMINMAX_ACTIVATIONS = {"softmin", "softmax", "logsoftmax"}
 
+# Activations with learnable parameters or non-deterministic behavior, for which
+# a new module instance must be created on every request (cf. ``activation()``).
+STATEFUL_ACTIVATIONS = {"prelu", "rrelu"}
+
+# Cache of stateless activation modules which are shared across layers
+_ACTIVATION_CACHE: dict = {}
+
 
 def activation(
     arg: ActivationArg,
@@ -76,13 +83,24 @@ def activation(
             tuple item when ``arg`` is a ``(name, kwargs)`` tuple instead of a string.
 
     Returns:
-        Given activation function when ``arg`` is a ``torch.nn.Module``, or a new activation module otherwise.
+        Given activation function when ``arg`` is a ``torch.nn.Module``, or an activation module otherwise.
+        Stateless activation modules requested by name are cached and shared across calls, given that
+        these have no learnable parameters and their construction is pure Python overhead when networks
+        are instantiated many times.
 
     """
     if isinstance(arg, Module) and not args and not kwargs:
         return arg
     if callable(arg):
         return Activation(arg, *args, **kwargs)
+    cache_key = None
+    if isinstance(arg, str) and not args and not kwargs and dim is None:
+        name = arg.lower()
+        if name not in STATEFUL_ACTIVATIONS:
+            cache_key = (name, inplace)
+            acti = _ACTIVATION_CACHE.get(cache_key)
+            if acti is not None:
+                return acti
     acti_name = "identity"
     acti_args = {}
     if isinstance(arg, str):
@@ -125,6 +143,8 @@ def activation(
         acti = acti_type(dim)
     else:
         acti = acti_type(*args, **acti_args)
+    if cache_key is not None:
+        _ACTIVATION_CACHE[cache_key] = acti
     return acti
 
 
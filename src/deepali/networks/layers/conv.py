@@ -3,12 +3,17 @@ r"""Convolutional layers."""
 # TODO: ConvLayer() support use of dropout, by default between N and A.
 
 from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 import math
 from numbers import Integral
-from typing import Any, Mapping, Optional, Tuple, Union
+from typing import Any, Dict, Generator, List, Mapping, Optional, Tuple, Union
 
+import torch
 from torch.nn import Module, init
 from torch.nn.modules import Sequential
+from torch.nn.modules.batchnorm import _BatchNorm, _NormBase
+from torch.nn.parameter import Parameter
 from torch.nn.modules import Conv1d as _Conv1d, ConvTranspose1d as _ConvTranspose1d
 from torch.nn.modules import Conv2d as _Conv2d, ConvTranspose2d as _ConvTranspose2d
 from torch.nn.modules import Conv3d as _Conv3d, ConvTranspose3d as _ConvTranspose3d
@@ -36,6 +41,9 @@ __all__ = (
     "ConvLayer",
     "convolution",
     "conv_module",
+    "deferred_conv_init",
+    "fuse_depthwise_separable",
+    "initialize_conv_weights",
     "is_convolution",
     "is_conv_module",
     "is_transposed_convolution",
@@ -47,7 +55,23 @@ __all__ = (
 class _ConvInit(object):
     r"""Mix-in for initialization of convolutional layer parameters."""
 
+    _deferred_init = False
+
+    # Class-level defaults such that subclass constructors only need to write an instance
+    # attribute for non-default initialization modes (cf. ``_init_attrs()``).
+    weight_init = "uniform"
+    bias_init = "uniform"
+
+    def _init_attrs(self, bias: Union[bool, str], init: str) -> None:
+        r"""Set parameter initialization modes, avoiding instance writes for default values."""
+        if not isinstance(bias, bool) and bias != "uniform":
+            self.bias_init = bias
+        if init not in ("default", "uniform"):
+            self.weight_init = init
+
     def reset_parameters(self) -> None:
+        if self._deferred_init:
+            return
         # Initialize weights
         if self.weight_init in ("default", "uniform"):
             init.kaiming_uniform_(self.weight, a=math.sqrt(5))
@@ -77,6 +101,63 @@ class _ConvInit(object):
                 )
 
 
+@contextmanager
+def deferred_conv_init() -> Generator[None, None, None]:
+    r"""Context within which initialization of convolutional layer parameters is deferred.
+
+    Convolutional layers constructed within this context skip the eager initialization of
+    their parameters otherwise triggered by ``torch.nn.modules.conv._ConvNd.__init__()``.
+    Use :func:`initialize_conv_weights` on the assembled model to initialize the parameters
+    of all convolutions in batches, which is faster for deep networks with many layers.
+
+    """
+    prev = _ConvInit._deferred_init
+    _ConvInit._deferred_init = True
+    try:
+        yield
+    finally:
+        _ConvInit._deferred_init = prev
+
+
+def initialize_conv_weights(module: Module) -> None:
+    r"""Initialize parameters of all convolutional layers of a model in batches.
+
+    Equivalent to calling ``reset_parameters()`` on every convolutional layer of the model,
+    but layers with default uniform initialization are grouped by device and data type and
+    filled from a single random sample per group. This replaces one small RNG launch per
+    layer by one launch per group, which reduces model construction latency, in particular
+    when the parameters reside on a CUDA device. Note that ``kaiming_uniform_`` with
+    negative slope ``a=sqrt(5)`` is equal to ``U(-1/sqrt(fan_in), 1/sqrt(fan_in))``, the
+    same distribution as used for the default bias initialization.
+
+    """
+    groups: Dict[Tuple[torch.device, torch.dtype], List[_ConvInit]] = {}
+    for m in module.modules():
+        if not isinstance(m, _ConvInit):
+            continue
+        uniform_weight = m.weight_init in ("default", "uniform")
+        uniform_bias = m.bias is None or m.bias_init in ("default", "uniform")
+        if uniform_weight and uniform_bias:
+            groups.setdefault((m.weight.device, m.weight.dtype), []).append(m)
+        else:
+            m.reset_parameters()
+    with torch.no_grad():
+        for (device, dtype), convs in groups.items():
+            params = [p for m in convs for p in (m.weight, m.bias) if p is not None]
+            numel = sum(p.numel() for p in params)
+            sample = torch.empty(numel, dtype=dtype, device=device).uniform_(-1, 1)
+            offset = 0
+            for m in convs:
+                fan_in, _ = init._calculate_fan_in_and_fan_out(m.weight)
+                bound = 1 / math.sqrt(fan_in)
+                for p in (m.weight, m.bias):
+                    if p is None:
+                        continue
+                    n = p.numel()
+                    p.copy_(sample[offset : offset + n].view_as(p)).mul_(bound)
+                    offset += n
+
+
 class Conv1d(_ConvInit, _Conv1d):
     r"""Convolutional layer with custom initialization of learnable parameters."""
 
@@ -93,8 +174,7 @@ class Conv1d(_ConvInit, _Conv1d):
         padding_mode: str = "zeros",
         init: str = "default",
     ):
-        self.bias_init = "uniform" if isinstance(bias, bool) else bias
-        self.weight_init = "uniform" if init == "default" else init
+        self._init_attrs(bias, init)
         super().__init__(
             in_channels,
             out_channels,
@@ -124,8 +204,7 @@ class Conv2d(_ConvInit, _Conv2d):
         padding_mode: str = "zeros",
         init: str = "default",
     ):
-        self.bias_init = "uniform" if isinstance(bias, bool) else bias
-        self.weight_init = "uniform" if init == "default" else init
+        self._init_attrs(bias, init)
         super().__init__(
             in_channels,
             out_channels,
@@ -155,8 +234,7 @@ class Conv3d(_ConvInit, _Conv3d):
         padding_mode: str = "zeros",
         init: str = "uniform",
     ):
-        self.bias_init = "uniform" if isinstance(bias, bool) else bias
-        self.weight_init = "uniform" if init == "default" else init
+        self._init_attrs(bias, init)
         super().__init__(
             in_channels,
             out_channels,
@@ -187,8 +265,7 @@ class ConvTranspose1d(_ConvInit, _ConvTranspose1d):
         padding_mode: str = "zeros",
         init: str = "default",
     ):
-        self.bias_init = "uniform" if isinstance(bias, bool) else bias
-        self.weight_init = "uniform" if init == "default" else init
+        self._init_attrs(bias, init)
         super().__init__(
             in_channels,
             out_channels,
@@ -220,8 +297,7 @@ class ConvTranspose2d(_ConvInit, _ConvTranspose2d):
         padding_mode: str = "zeros",
         init: str = "default",
     ):
-        self.bias_init = "uniform" if isinstance(bias, bool) else bias
-        self.weight_init = "uniform" if init == "default" else init
+        self._init_attrs(bias, init)
         super().__init__(
             in_channels,
             out_channels,
@@ -253,8 +329,7 @@ class ConvTranspose3d(_ConvInit, _ConvTranspose3d):
         padding_mode: str = "zeros",
         init: str = "default",
     ):
-        self.bias_init = "uniform" if isinstance(bias, bool) else bias
-        self.weight_init = "uniform" if init == "default" else init
+        self._init_attrs(bias, init)
         super().__init__(
             in_channels,
             out_channels,
@@ -269,6 +344,14 @@ class ConvTranspose3d(_ConvInit, _ConvTranspose3d):
         )
 
 
+@lru_cache(maxsize=None)
+def _conv_layer_module_names(order: str, has_acti: bool, has_norm: bool) -> Tuple[str, ...]:
+    r"""Ordered sub-module names of a ``ConvLayer``, memoized over the small set of layer orders."""
+    present = {"A": has_acti, "N": has_norm, "C": True}
+    names = {"A": "acti", "N": "norm", "C": "conv"}
+    return tuple(names[k] for k in order if present[k])
+
+
 class ConvLayer(ReprWithCrossReferences, Sequential):
     r"""Convolutional layer with optional pre- or post-convolution normalization and/or activation."""
 
@@ -291,6 +374,7 @@ class ConvLayer(ReprWithCrossReferences, Sequential):
         order: str = "CNA",
         transposed: bool = False,
         conv: Optional[Module] = None,
+        compute_dtype: Optional[torch.dtype] = None,
     ) -> None:
         if spatial_dims < 0 or spatial_dims > 3:
             raise ValueError("ConvLayer() 'spatial_dims' must be 1, 2, or 3")
@@ -328,7 +412,15 @@ class ConvLayer(ReprWithCrossReferences, Sequential):
         if bias is None:
             bias = True
             if norm_after_conv and isinstance(norm_layer, Module):
-                bias = not getattr(norm_layer, "affine", False)
+                # A convolution bias is redundant when the following normalization has an
+                # affine shift of its own, or computes per-channel statistics which absorb
+                # any constant channel offset regardless of an affine transformation.
+                redundant = getattr(norm_layer, "affine", False) or getattr(
+                    norm_layer, "elementwise_affine", False
+                )
+                if not redundant and isinstance(norm_layer, _NormBase):
+                    redundant = True
+                bias = not redundant
         if output_padding is None:
             output_padding = stride_minus_kernel_padding(1, stride)
         if conv is None:
@@ -348,13 +440,9 @@ class ConvLayer(ReprWithCrossReferences, Sequential):
                 transposed=transposed,
             )
         # Initialize module
-        modules = {
-            "A": ("acti", acti_fn),
-            "N": ("norm", norm_layer),
-            "C": ("conv", conv),
-        }
-        modules = OrderedDict(modules[k] for k in order if modules[k][1] is not None)
-        super().__init__(modules)
+        modules = {"acti": acti_fn, "norm": norm_layer, "conv": conv}
+        names = _conv_layer_module_names(order, acti_fn is not None, norm_layer is not None)
+        super().__init__(OrderedDict((name, modules[name]) for name in names))
         if acti_fn is None:
             self.acti = None
         if norm_layer is None:
@@ -363,12 +451,120 @@ class ConvLayer(ReprWithCrossReferences, Sequential):
         self.in_channels = in_channels
         self.out_channels = out_channels
         self.order = order
+        self.compute_dtype = compute_dtype
+
+    def forward(self, input: torch.Tensor) -> torch.Tensor:
+        dtype = self.compute_dtype
+        if dtype is None or input.device.type not in ("cuda", "cpu"):
+            return super().forward(input)
+        # Evaluate layer in reduced precision with autocast, which keeps the parameters
+        # as float32 master weights and computes normalization statistics in float32,
+        # while the convolution itself runs in the reduced precision on tensor cores.
+        with torch.autocast(input.device.type, dtype=dtype):
+            output = super().forward(input)
+        return output if output.dtype == input.dtype else output.to(input.dtype)
 
     def has_norm_after_conv(self) -> bool:
         r"""Whether this layer has a normalization layer after the convolution."""
         names = tuple(name for name, _ in self.named_modules() if name in ("conv", "norm"))
         return len(names) == 2 and names[-1] == "norm"
 
+    def fuse_for_inference(self) -> "ConvLayer":
+        r"""Fold a batch normalization following the convolution into the convolution.
+
+        When this layer is in evaluation mode and a batch normalization with tracked running
+        statistics directly follows the convolution, the normalization is folded into the
+        convolution weights and bias and the normalization module is removed. This eliminates
+        one full read-modify-write pass over the output feature maps per forward. The layer
+        is returned unchanged when fusion is not applicable.
+
+        """
+        if self.training:
+            return self
+        conv = self.conv
+        norm = self.norm
+        if norm is None or not self.has_norm_after_conv():
+            return self
+        if not isinstance(conv, (Conv1d, Conv2d, Conv3d)):
+            return self
+        if not isinstance(norm, _BatchNorm):
+            return self
+        if norm.running_mean is None or norm.running_var is None:
+            return self
+        with torch.no_grad():
+            std = torch.sqrt(norm.running_var + norm.eps)
+            scale = (norm.weight if norm.affine else 1) / std
+            shift = (norm.bias if norm.affine else 0) - norm.running_mean * scale
+            weight = conv.weight * scale.reshape(-1, *((1,) * (conv.weight.ndim - 1)))
+            bias = shift if conv.bias is None else conv.bias * scale + shift
+            conv.weight.copy_(weight)
+            if conv.bias is None:
+                conv.bias = Parameter(bias)
+            else:
+                conv.bias.copy_(bias)
+        del self.norm
+        self.norm = None
+        return self
+
+    def _absorb_bias_into_norm(self) -> None:
+        r"""Fold convolution bias into running mean of a following batch normalization.
+
+        When a batch normalization with tracked running statistics follows the convolution
+        at evaluation time, a constant channel offset is equal to a shift of the running
+        mean. Folding the bias into the normalization removes one full-volume broadcast
+        add per forward and frees the bias parameter.
+
+        """
+        if self.training:
+            return
+        conv = self.conv
+        norm = self.norm
+        if norm is None or not self.has_norm_after_conv():
+            return
+        if getattr(conv, "bias", None) is None:
+            return
+        if not isinstance(norm, _BatchNorm) or norm.running_mean is None:
+            return
+        with torch.no_grad():
+            norm.running_mean -= conv.bias
+        conv.register_parameter("bias", None)
+
+    def eval_optimize(self) -> "ConvLayer":
+        r"""Apply inference-time optimizations to this layer.
+
+        Must be called after switching the model to evaluation mode. Folds a batch
+        normalization following the convolution into the convolution parameters where
+        possible (cf. :meth:`fuse_for_inference`), and otherwise absorbs a redundant
+        convolution bias into the normalization statistics. No-op in training mode.
+
+        """
+        if self.training:
+            return self
+        self.fuse_for_inference()
+        self._absorb_bias_into_norm()
+        return self
+
+    def compile(self, *args, **kwargs) -> None:
+        r"""Compile this layer in-place using :func:`torch.compile`.
+
+        Compilation lets the Inductor backend fuse the pointwise operations of the
+        normalization (in evaluation mode) and the activation into the convolution
+        epilogue, which avoids extra memory round trips per forward pass. Unless
+        overridden by keyword arguments, ``mode="reduce-overhead"`` is used. This
+        function is a no-op for torch versions without ``torch.compile``.
+
+        """
+        if not hasattr(torch, "compile"):
+            return
+        kwargs.setdefault("mode", "reduce-overhead")
+        kwargs.setdefault("fullgraph", False)
+        kwargs.setdefault("dynamic", False)
+        if hasattr(Module, "compile"):
+            super().compile(*args, **kwargs)
+        else:
+            # torch >=2.0,<2.1 provides torch.compile but not Module.compile
+            self.forward = torch.compile(self.forward, *args, **kwargs)
+
 
 def convolution(
     spatial_dims: int,
@@ -384,8 +580,15 @@ def convolution(
     init: str = "default",
     bias: Union[bool, str] = True,
     transposed: bool = False,
+    memory_format: Optional[torch.memory_format] = None,
 ) -> Module:
-    r"""Create convolution module for specified number of spatial input tensor dimensions."""
+    r"""Create convolution module for specified number of spatial input tensor dimensions.
+
+    When ``memory_format`` is ``torch.channels_last`` (2D) or ``torch.channels_last_3d`` (3D),
+    the parameters of the created module are converted to this memory layout such that cuDNN
+    can select its faster NHWC tensor core kernels for inputs in the same layout.
+
+    """
     if in_channels < 1:
         raise ValueError(f"convolution() 'in_channels' ({in_channels}) must be positive")
     if out_channels < 1:
@@ -419,7 +622,10 @@ def convolution(
         conv_type = ConvTranspose3d if transposed else Conv3d
     else:
         raise ValueError("convolution() 'spatial_dims' must be 1, 2, or 3")
-    return conv_type(in_channels, out_channels, **kwargs)
+    conv = conv_type(in_channels, out_channels, **kwargs)
+    if memory_format is not None:
+        conv = conv.to(memory_format=memory_format)
+    return conv
 
 
 def conv_module(*args, **kwargs) -> Module:
@@ -427,25 +633,109 @@ def conv_module(*args, **kwargs) -> Module:
     return convolution(*args, **kwargs)
 
 
+def fuse_depthwise_separable(depthwise: Module, pointwise: Module) -> Optional[Module]:
+    r"""Fold a depthwise convolution followed by a pointwise convolution into a dense convolution.
+
+    A depthwise separable convolution, i.e., a depthwise convolution whose output is consumed
+    directly by a 1x1 pointwise convolution without intermediate normalization or activation, is
+    mathematically equal to a single dense convolution whose kernel is the product of the two
+    factorized kernels. The fused convolution performs more arithmetic but reads and writes the
+    feature maps only once, which pays off on the CPU where the separate depthwise pass has very
+    low arithmetic intensity. On the GPU the factorized form is served by specialized cuDNN
+    kernels and fusion generally hurts, hence ``None`` is returned for CUDA parameters.
+
+    Args:
+        depthwise: Convolution with ``groups == in_channels``.
+        pointwise: Unit kernel size convolution with ``groups=1``, unit stride, and no padding,
+            applied to the output of ``depthwise``.
+
+    Returns:
+        New dense convolution module which computes ``pointwise(depthwise(x))``, or ``None``
+        when the given pair of modules cannot be fused.
+
+    """
+    conv_types = {1: Conv1d, 2: Conv2d, 3: Conv3d}
+    spatial_dims = {_Conv1d: 1, _Conv2d: 2, _Conv3d: 3}
+    for conv in (depthwise, pointwise):
+        if not isinstance(conv, (_Conv1d, _Conv2d, _Conv3d)):
+            return None
+    ndim = next(d for t, d in spatial_dims.items() if isinstance(depthwise, t))
+    if next(d for t, d in spatial_dims.items() if isinstance(pointwise, t)) != ndim:
+        return None
+    if depthwise.weight.is_cuda or pointwise.weight.is_cuda:
+        return None
+    if depthwise.groups != depthwise.in_channels:
+        return None
+    if pointwise.groups != 1:
+        return None
+    if pointwise.in_channels != depthwise.out_channels:
+        return None
+    if any(k != 1 for k in pointwise.kernel_size):
+        return None
+    if any(s != 1 for s in pointwise.stride) or any(p != 0 for p in pointwise.padding):
+        return None
+    with torch.no_grad():
+        n_in = depthwise.in_channels
+        n_mid = depthwise.out_channels
+        n_out = pointwise.out_channels
+        multiplier = n_mid // n_in
+        dw_weight = depthwise.weight.reshape(n_in, multiplier, -1)
+        pw_weight = pointwise.weight.reshape(n_out, n_in, multiplier)
+        weight = torch.einsum("oim,imk->oik", pw_weight, dw_weight)
+        weight = weight.reshape(n_out, n_in, *depthwise.kernel_size)
+        bias = pointwise.bias
+        if depthwise.bias is not None:
+            shift = pw_weight.reshape(n_out, n_mid).matmul(depthwise.bias)
+            bias = shift if bias is None else bias + shift
+        fused = conv_types[ndim](
+            n_in,
+            n_out,
+            kernel_size=depthwise.kernel_size,
+            stride=depthwise.stride,
+            padding=depthwise.padding,
+            dilation=depthwise.dilation,
+            bias=bias is not None,
+            padding_mode=depthwise.padding_mode,
+        )
+        fused.weight.copy_(weight)
+        if bias is not None:
+            fused.bias.copy_(bias)
+    return fused
+
+
+_CONV_TYPES = (
+    _Conv1d,
+    _Conv2d,
+    _Conv3d,
+    _ConvTranspose1d,
+    _ConvTranspose2d,
+    _ConvTranspose3d,
+)
+
+_TRANSPOSED_CONV_TYPES = (_ConvTranspose1d, _ConvTranspose2d, _ConvTranspose3d)
+
+# Exact types checked in O(1) before falling back to the linear isinstance() scan,
+# which short-circuits the common case when the predicates below are evaluated for
+# every submodule of a network. Other subclasses are still matched by isinstance().
+_CONV_TYPE_SET = frozenset(
+    _CONV_TYPES + (Conv1d, Conv2d, Conv3d, ConvTranspose1d, ConvTranspose2d, ConvTranspose3d)
+)
+
+_TRANSPOSED_CONV_TYPE_SET = frozenset(
+    _TRANSPOSED_CONV_TYPES + (ConvTranspose1d, ConvTranspose2d, ConvTranspose3d)
+)
+
+
 def is_convolution(arg: Any) -> bool:
     r"""Whether given module is a learnable convolution."""
-    types = (
-        _Conv1d,
-        _Conv2d,
-        _Conv3d,
-        _ConvTranspose1d,
-        _ConvTranspose2d,
-        _ConvTranspose3d,
-    )
-    return isinstance(arg, types)
+    return type(arg) in _CONV_TYPE_SET or isinstance(arg, _CONV_TYPES)
 
 
 def is_conv_module(arg: Any) -> bool:
     r"""Whether given module is a learnable convolution."""
-    return is_convolution(arg)
+    return type(arg) in _CONV_TYPE_SET or isinstance(arg, _CONV_TYPES)
 
 
 def is_transposed_convolution(arg: Any) -> bool:
     r"""Whether given module is a learnable transposed convolution."""
-    types = (_ConvTranspose1d, _ConvTranspose2d, _ConvTranspose3d)
-    return isinstance(arg, types)
+    return type(arg) in _TRANSPOSED_CONV_TYPE_SET or isinstance(arg, _TRANSPOSED_CONV_TYPES)
@@ -1,10 +1,27 @@
 r"""Auxiliary functions for conversion between SimpleITK and PyTorch."""
 
 from typing import Optional, Sequence
+import warnings
 
+import numpy as np
 import SimpleITK as sitk
 import torch
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+if njit is None:
+    _widen_unsigned = None
+else:
+
+    @njit(parallel=True, cache=True)
+    def _widen_unsigned(arr, out):  # pragma: no cover
+        for i in prange(arr.size):
+            out[i] = arr[i]
+
 
 def image_from_tensor(
     data: torch.Tensor,
@@ -24,12 +41,16 @@ def image_from_tensor(
         SimpleITK image.
 
     """
-    data = data.detach().cpu()
+    data = data.detach()
     nchannels = data.shape[0]
     if nchannels == 1:
         data = data[0]
     else:
-        data = data.unsqueeze(-1).transpose(0, -1).squeeze(0)
+        # Move the channel dimension last with a single permute and materialize the copy
+        # before the host transfer, such that a GPU tensor is transposed on the device and
+        # .numpy() below need not copy the non-contiguous tensor a second time.
+        data = data.permute(*range(1, data.ndim), 0).contiguous()
+    data = data.cpu()
     image = sitk.GetImageFromArray(data.numpy(), isVector=nchannels > 1)
     if origin:
         image.SetOrigin(origin)
@@ -46,12 +67,46 @@ def tensor_from_image(
     device: Optional[torch.device] = None,
 ) -> torch.Tensor:
     r"""Create image data tensor from ``SimpleITK.Image``."""
-    if image.GetPixelID() == sitk.sitkUInt16:
-        image = sitk.Cast(image, sitk.sitkInt32)
-    elif image.GetPixelID() == sitk.sitkUInt16:
-        image = sitk.Cast(image, sitk.sitkInt64)
-    data = torch.from_numpy(sitk.GetArrayFromImage(image))
+    pixel_id = image.GetPixelID()
+    data = None
+    aliases_buffer = False
+    if pixel_id in (sitk.sitkUInt16, sitk.sitkUInt32):
+        # Widen unsigned integer pixels to the next larger signed type supported by torch.
+        # When Numba is available, widen directly from a view of the ITK image buffer into
+        # a preallocated array using a parallel SIMD-vectorizable loop, which avoids the
+        # serial full-image copy otherwise made by sitk.Cast().
+        if _widen_unsigned is not None:
+            view = sitk.GetArrayViewFromImage(image)
+            arr = np.empty(view.shape, np.int32 if pixel_id == sitk.sitkUInt16 else np.int64)
+            _widen_unsigned(view.reshape(-1), arr.reshape(-1))
+            data = torch.from_numpy(arr)
+        elif pixel_id == sitk.sitkUInt16:
+            image = sitk.Cast(image, sitk.sitkInt32)
+        else:
+            image = sitk.Cast(image, sitk.sitkInt64)
+    if data is None:
+        # Wrap a zero-copy view of the ITK image buffer instead of copying it with
+        # sitk.GetArrayFromImage(), such that the requested dtype and device conversion
+        # makes the only copy of the image data. The view is read-only and never written
+        # to, hence the PyTorch warning about non-writable arrays can be ignored.
+        view = sitk.GetArrayViewFromImage(image)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            data = torch.from_numpy(view)
+        aliases_buffer = True
+    if device is not None and torch.device(device).type == "cuda":
+        # Stage the host copy in pinned memory such that the host-to-device copy is
+        # asynchronous with respect to the host and can overlap with computation.
+        data = data.pin_memory()
+        data = data.to(dtype=dtype, device=device, non_blocking=True)
+    else:
+        copy = data.to(dtype=dtype, device=device)
+        # Ensure the returned tensor does not alias the ITK image buffer, which is
+        # freed when the (possibly temporary) image object is garbage collected.
+        if aliases_buffer and copy.data_ptr() == data.data_ptr():
+            copy = copy.clone()
+        data = copy
     data = data.unsqueeze(0)
     if image.GetNumberOfComponentsPerPixel() > 1:
         data = data.transpose(0, -1).squeeze(-1)
-    return data.to(dtype=dtype, device=device)
+    return data
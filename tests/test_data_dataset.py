@@ -0,0 +1,103 @@
+r"""Test dataset of packed memory-mapped image data."""
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+import torch
+
+from deepali.core import Grid
+from deepali.data import Dataset, Image, MemmapImageDataset
+
+
+class DictDataset(Dataset):
+    r"""Dataset serving preconstructed sample dictionaries."""
+
+    def __init__(self, samples: List[Dict[str, Any]]) -> None:
+        self.samples = samples
+        super().__init__()
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def sample(self, index: int) -> Dict[str, Any]:
+        return self.samples[index]
+
+
+def make_image(seed: int, grid: Grid) -> Image:
+    generator = torch.Generator().manual_seed(seed)
+    shape = (1,) + tuple(grid.shape)
+    return Image(torch.randn(shape, generator=generator), grid)
+
+
+def make_samples() -> List[Dict[str, Any]]:
+    samples = []
+    for index in range(3):
+        grid_a = Grid(size=(6, 5, 4), spacing=(0.5, 0.5, 1.0), center=(index, 0.0, 0.0))
+        grid_b = Grid(size=(8, 7), spacing=(0.25, 0.2), center=(0.0, index))
+        samples.append(
+            {
+                "t1": make_image(2 * index, grid_a),
+                "t2": make_image(2 * index + 1, grid_b),
+                "meta": {"id": f"sub-{index}", "info": {"site": "A", "visit": index}},
+            }
+        )
+    return samples
+
+
+def test_memmap_image_dataset_pack(tmp_path: Path) -> None:
+    r"""Test pack, reload, and indexing round trip of memory-mapped image dataset."""
+
+    samples = make_samples()
+    dataset = DictDataset(samples)
+    path = tmp_path / "packed"
+
+    packed = MemmapImageDataset.pack(dataset, path)
+    assert isinstance(packed, MemmapImageDataset)
+    assert (path / MemmapImageDataset.INDEX_FILE).is_file()
+    assert (path / "t1.npy").is_file()
+    assert (path / "t2.npy").is_file()
+
+    # Reload from disk and compare both datasets against the input samples
+    reloaded = MemmapImageDataset(path)
+    for ds in (packed, reloaded):
+        assert len(ds) == len(samples)
+        for index in range(len(samples)):
+            item = ds[index]
+            for key in ("t1", "t2"):
+                image = item[key]
+                expected = samples[index][key]
+                assert isinstance(image, Image)
+                assert image.grid() == expected.grid()
+                assert torch.allclose(image.tensor(), expected.tensor())
+            assert item["meta"] == samples[index]["meta"]
+
+    # pack() of an existing directory returns the packed dataset without re-packing
+    again = MemmapImageDataset.pack(DictDataset(samples[:1]), path)
+    assert len(again) == len(samples)
+
+    # Restrict packed image data to subset of sample keys
+    partial = MemmapImageDataset.pack(dataset, tmp_path / "partial", keys=["t2"])
+    assert set(partial.arrays.keys()) == {"t2"}
+    item = partial[1]
+    assert "t1" not in item
+    assert torch.allclose(item["t2"].tensor(), samples[1]["t2"].tensor())
+
+
+def test_memmap_image_dataset_pack_missing_key(tmp_path: Path) -> None:
+    r"""Test error when a sample is missing a previously packed image key."""
+
+    samples = make_samples()
+    del samples[1]["t2"]
+    with pytest.raises(ValueError, match="sample 1 is missing image 't2'"):
+        MemmapImageDataset.pack(DictDataset(samples), tmp_path / "missing")
+
+    samples = make_samples()
+    del samples[0]["t2"]
+    with pytest.raises(ValueError, match="first occurs in sample 1"):
+        MemmapImageDataset.pack(DictDataset(samples), tmp_path / "late")
+
+    samples = make_samples()
+    samples[2]["t1"] = make_image(42, Grid(size=(3, 3, 3)))
+    with pytest.raises(ValueError, match="shape"):
+        MemmapImageDataset.pack(DictDataset(samples), tmp_path / "shape")
@@ -8,6 +8,7 @@ from torch import Tensor, nn
 from deepali.core.enum import PaddingMode
 from deepali.networks.layers import Activation, activation
 from deepali.networks.layers import Conv2d, Conv3d, ConvLayer, convolution, conv_module
+from deepali.networks.layers import fuse_depthwise_separable
 from deepali.networks.layers import JoinLayer, join_func
 from deepali.networks.layers import LambdaLayer
 from deepali.networks.layers import NormLayer, normalization, norm_layer
@@ -177,6 +178,82 @@ def test_conv_layer() -> None:
     assert y.allclose(z)
 
 
+def test_conv_layer_eval_optimize() -> None:
+    r"""Test inference-time folding of batch normalization into convolution."""
+
+    x = torch.randn((2, 3, 16, 16))
+
+    for affine in (True, False):
+        for bias in (False, True):
+            layer = ConvLayer(
+                2, 3, 8, 3, norm=("batch", {"affine": affine}), acti="relu", bias=bias
+            )
+            assert isinstance(layer.norm, nn.BatchNorm2d)
+            assert isinstance(layer.conv.bias, Tensor) is bias
+            layer.train()
+            for _ in range(3):
+                layer(torch.randn((2, 3, 16, 16)).mul_(2).add_(0.5))
+            layer.eval()
+            expected = layer(x)
+            layer.eval_optimize()
+            assert layer.norm is None
+            assert isinstance(layer.conv.bias, Tensor)
+            assert layer(x).allclose(expected, atol=1e-5)
+
+    # In training mode, eval_optimize() is a no-op
+    layer = ConvLayer(2, 3, 8, 3, norm="batch", acti="relu")
+    layer.train()
+    layer.eval_optimize()
+    assert isinstance(layer.norm, nn.BatchNorm2d)
+
+    # A convolution module which cannot be folded retains the normalization, but its
+    # redundant bias is absorbed into the batch normalization running mean
+    conv = nn.Conv2d(3, 8, 3, padding=1, bias=True)
+    layer = ConvLayer(2, 3, 8, 3, norm="batch", acti="relu", conv=conv)
+    layer.train()
+    for _ in range(3):
+        layer(torch.randn((2, 3, 16, 16)).mul_(2).add_(0.5))
+    layer.eval()
+    expected = layer(x)
+    layer.eval_optimize()
+    assert isinstance(layer.norm, nn.BatchNorm2d)
+    assert layer.conv.bias is None
+    assert layer(x).allclose(expected, atol=1e-5)
+
+
+def test_fuse_depthwise_separable() -> None:
+    r"""Test folding of depthwise separable convolution into dense convolution."""
+
+    for spatial_dims in (2, 3):
+        size = (13, 9, 11)[:spatial_dims]
+        x = torch.randn((2, 4) + size)
+        for multiplier in (1, 2):
+            for dw_bias in (False, True):
+                for pw_bias in (False, True):
+                    depthwise = convolution(
+                        spatial_dims, 4, 4 * multiplier, 3, padding=1, groups=4, bias=dw_bias
+                    )
+                    pointwise = convolution(
+                        spatial_dims, 4 * multiplier, 6, kernel_size=1, bias=pw_bias
+                    )
+                    fused = fuse_depthwise_separable(depthwise, pointwise)
+                    assert isinstance(fused, (nn.Conv2d, nn.Conv3d))
+                    assert fused.groups == 1
+                    assert fused.kernel_size == depthwise.kernel_size
+                    assert (fused.bias is not None) is (dw_bias or pw_bias)
+                    expected = pointwise(depthwise(x))
+                    assert fused(x).allclose(expected, atol=1e-5)
+
+    # Pairs which cannot be fused
+    depthwise = convolution(2, 4, 4, 3, padding=1, groups=4)
+    assert fuse_depthwise_separable(depthwise, convolution(2, 4, 6, 3, padding=1)) is None
+    assert fuse_depthwise_separable(depthwise, convolution(3, 4, 6, kernel_size=1)) is None
+    grouped = convolution(2, 4, 4, 3, padding=1, groups=2)
+    assert fuse_depthwise_separable(grouped, convolution(2, 4, 6, kernel_size=1)) is None
+    strided = convolution(2, 4, 6, kernel_size=1, stride=2)
+    assert fuse_depthwise_separable(depthwise, strided) is None
+
+
 def test_join_layer() -> None:
     r"""Test layer which joins features of one or more input tensors."""
 